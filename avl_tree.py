@@ -1,3 +1,13 @@
+import bisect
+import collections
+import functools
+import math
+import operator
+import sys
+
+import serialization
+
+
 class AVLNode:
     """Represents a node in an AVL tree"""
     __slots__ = ['height', 'left_child', 'right_child', 'key', 'value']
@@ -44,6 +54,22 @@ class AVLNode:
 
         return output
 
+    def copy(self):
+        """
+        Copies this node and its children, preserving their shape & heights.
+
+        :return: The new node.
+        """
+        node = self.__class__(self.key, self.value)
+        node.height = self.height
+
+        if self.left_child:
+            node.left_child = self.left_child.copy()
+        if self.right_child:
+            node.right_child = self.right_child.copy()
+
+        return node
+
     def get_relative_left_height(self):
         """
         :return: Difference between left child's height and right's height.
@@ -66,7 +92,7 @@ class AVLNode:
         if self.left_child:
             yield from self.left_child.in_order_traversal()
         yield self
-        if self.left_child:
+        if self.right_child:
             yield from self.right_child.in_order_traversal()
 
     def pre_order_traversal(self):
@@ -78,7 +104,7 @@ class AVLNode:
         yield self
         if self.left_child:
             yield from self.left_child.pre_order_traversal()
-        if self.left_child:
+        if self.right_child:
             yield from self.right_child.pre_order_traversal()
 
     def post_order_traversal(self):
@@ -89,7 +115,7 @@ class AVLNode:
         """
         if self.left_child:
             yield from self.left_child.post_order_traversal()
-        if self.left_child:
+        if self.right_child:
             yield from self.right_child.post_order_traversal()
         yield self
 
@@ -102,7 +128,13 @@ class AVLTree:
         - queries (find/predecessor/successor)
         - insertion/deletion
     """
-    __slots__ = ['_root', '_length']
+    __slots__ = ['_root', '_length', '_shared']
+
+    # Identifies dumps of AVLTrees
+    MAGIC = b'AVL1'
+
+    # Class of nodes created by this tree
+    _node_class = AVLNode
 
     def __init__(self, items=None):
         """
@@ -113,6 +145,9 @@ class AVLTree:
         self._root = None
         self._length = 0
 
+        # Count of trees sharing nodes with this one (see copy), if any
+        self._shared = None
+
         if items:
             for key, value in items:
                 self.insert(key, value)
@@ -132,22 +167,135 @@ class AVLTree:
 
         return tree
 
+    @classmethod
+    def from_sorted_items(cls, items):
+        """
+        Constructs a balanced AVLTree from items sorted by key, in O(n) time.
+
+        :param items: Iterable of key, value pairs, in increasing order of
+            key, with distinct keys.
+        :return: Newly constructed AVLTree.
+
+        Raises:
+            ValueError: If keys are not in increasing order.
+        """
+        keys = []
+        values = []
+
+        for key, value in items:
+            if keys and not keys[-1] < key:
+                raise ValueError("Keys not in increasing order: {!r}, "
+                                 "{!r}".format(keys[-1], key))
+
+            keys.append(key)
+            values.append(value)
+
+        return cls._from_sorted_columns(keys, values)
+
+    @classmethod
+    def _from_sorted_columns(cls, keys, values):
+        """
+        Constructs a balanced AVLTree from sorted, distinct keys, by making
+        the middle key the root of the keys before and after it, recursively.
+
+        :param keys: List of keys, in increasing order.
+        :param values: List of values, associated with keys.
+        :return: Newly constructed AVLTree.
+        """
+        tree = cls()
+        node_class = tree._node_class
+
+        def build(start, stop):
+            if start >= stop:
+                return None
+
+            middle = (start + stop) // 2
+            node = node_class(keys[middle], values[middle])
+            node.left_child = build(start, middle)
+            node.right_child = build(middle + 1, stop)
+            node.update_height()
+
+            return node
+
+        tree._root = build(0, len(keys))
+        tree._length = len(keys)
+
+        return tree
+
+    def dump(self, fileobj):
+        """
+        Writes the items of this tree, in order, to a binary file.
+
+        Keys and values are each stored as a column; a column of ints
+        (within 64 bits) or floats is packed as an array, others are pickled.
+
+        :param fileobj: Binary file opened for writing.
+        :return: None
+        """
+        keys = []
+        values = []
+
+        for node in self.in_order_traversal():
+            keys.append(node.key)
+            values.append(node.value)
+
+        serialization.dump_columns(fileobj, self.MAGIC, keys, values)
+
+    @classmethod
+    def load(cls, fileobj, use_mmap=False):
+        """
+        Constructs an AVLTree from a dump, in O(n) time.
+
+        :param fileobj: Binary file opened for reading, positioned at a dump.
+        :param use_mmap: If True, reads the dump from a memory map of
+            fileobj, rather than copying it into memory first.
+        :return: Newly constructed AVLTree.
+
+        Raises:
+            ValueError: If fileobj is not positioned at a dump of an AVLTree.
+        """
+        keys, values = serialization.load_columns(fileobj, cls.MAGIC,
+                                                  use_mmap)
+
+        return cls._from_sorted_columns(keys, values)
+
+    @classmethod
+    def map_keys(cls, fileobj):
+        """
+        Maps the sorted keys of a dump into memory, without loading the tree.
+
+        :param fileobj: Binary file opened for reading, positioned at a dump
+            whose keys are all ints or all floats.
+        :return: serialization.MappedKeys, which can be binary searched.
+        """
+        return serialization.MappedKeys(fileobj, cls.MAGIC)
+
     def get_root(self):
         """
         :return: The root node.
         """
         return self._root
 
+    def height(self):
+        """
+        :return: Height of this tree, 0 if it is empty.
+        """
+        return self._root.height if self._root else 0
+
     def insert(self, e, value=None):
         """
-        Inserts key into this AVLTree.
+        Inserts key into this AVLTree, or replaces the value associated with
+        key if it is already present.
 
         :param e: Key to be inserted.
         :param value: Optional value to be associated with key.
         :return: None
         """
+        if self._shared is not None:
+            self._unshare()
+
         u = self._root
-        z = AVLNode(e, value)
+        z = self._node_class(e, value)
 
         if u is None:
             self._root = z
@@ -160,7 +308,13 @@ class AVLTree:
             stack.append(u)
 
             if e == u.key:
-                u.value = e
+                u.value = value
+
+                # Aggregates (see AugmentedAVLTree) may depend on values
+                for node in reversed(stack):
+                    node.update_height()
+
+                return
             elif e < u.key:
                 if u.left_child:
                     u = u.left_child
@@ -413,6 +567,9 @@ class AVLTree:
         :param e: The key to remove.
         :return: Value formerly associated with key.
         """
+        if self._shared is not None:
+            self._unshare()
+
         u = self._root
 
         stack = []
@@ -579,19 +736,115 @@ class AVLTree:
         for node in self.in_order_traversal():
             yield node.key, node.value
 
-    def copy(self):
+    def memory_usage(self, deep=True):
         """
-        Returns a deepcopy of this tree.
+        Returns the number of bytes used by this tree and its nodes.
+
+        :param deep: Whether to include keys and values (and anything else
+            nodes refer to, such as aggregates). Each distinct object is
+            counted once, shallowly (as by sys.getsizeof).
+        :return: Number of bytes.
+        """
+        size = sys.getsizeof(self)
+        seen = set()
+
+        for node in self.in_order_traversal():
+            size += sys.getsizeof(node)
+
+            if deep:
+                for obj in self._node_objects(node):
+                    if id(obj) not in seen:
+                        seen.add(id(obj))
+                        size += sys.getsizeof(obj)
+
+        return size
+
+    @staticmethod
+    def _node_objects(node):
+        """
+        :return: The objects node refers to, for memory_usage.
+        """
+        return node.key, node.value
+
+    def copy(self, copy_on_write=False):
+        """
+        Returns a copy of this tree, with the same shape, in O(n) time.
+
+        Keys and values are not copied.
+
+        :param copy_on_write: If True, the copy shares this tree's nodes,
+            taking O(1) time, until either tree is modified, when the
+            modified tree first copies them.
         :return: New AVLTree.
         """
+        tree = self.__class__()
+        tree._length = self._length
 
-        tree = AVLTree()
+        if copy_on_write:
+            if self._shared is None:
+                self._shared = [1]
 
-        for node in self.pre_order_traversal():
-            tree.insert(node)
+            self._shared[0] += 1
+            tree._shared = self._shared
+            tree._root = self._root
+        elif self._root:
+            tree._root = self._root.copy()
 
         return tree
 
+    def _unshare(self):
+        """
+        Stops sharing nodes with copy-on-write copies, copying the nodes
+        unless no other tree still shares them.
+
+        :return: None
+        """
+        self._shared[0] -= 1
+
+        if self._shared[0] > 0 and self._root:
+            self._root = self._root.copy()
+
+        self._shared = None
+
+    def get_many(self, keys, default=None):
+        """
+        Finds the values associated with a sorted batch of keys, visiting
+        each node at most once, rather than searching from the root for
+        each key.
+
+        :param keys: Sequence of keys, in non-decreasing order.
+        :param default: Value for keys not in tree.
+        :return: List of the value associated with each key.
+
+        Raises:
+            ValueError: If keys are not in non-decreasing order.
+        """
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("Keys not in order: {!r}, {!r}".format(
+                    keys[i - 1], keys[i]))
+
+        values = [default] * len(keys)
+
+        def visit(node, start, stop):
+            # keys[start:stop] are all within the range of node's subtree
+            if node is None or start >= stop:
+                return
+
+            i = bisect.bisect_left(keys, node.key, start, stop)
+            j = i
+
+            while j < stop and keys[j] == node.key:
+                values[j] = node.value
+                j += 1
+
+            visit(node.left_child, start, i)
+            visit(node.right_child, j, stop)
+
+        visit(self._root, 0, len(keys))
+
+        return values
+
     def __getitem__(self, key):
         node = self._successor_node(key)
         if not node or node.key != key:
@@ -616,7 +869,7 @@ class AVLTree:
         yield from self.keys()
 
     def __repr__(self):
-        return "AVLTree({!r})".format(tuple(node.key for node in self))
+        return "AVLTree({!r})".format(tuple(self.keys()))
 
     def __str__(self):
         if self._root:
@@ -624,6 +877,721 @@ class AVLTree:
         else:
             return "<empty>"
 
+Monoid = collections.namedtuple('Monoid', ['combine', 'identity', 'measure'])
+Monoid.__doc__ = """Represents an associative aggregate of the items in an
+AugmentedAVLTree.
+
+combine(a, b) must be associative, with identity as its identity element,
+and measure(key, value) gives the aggregate of a single item.
+"""
+
+# Aggregates of values
+SUM = Monoid(operator.add, 0, lambda key, value: value)
+COUNT = Monoid(operator.add, 0, lambda key, value: 1)
+MIN = Monoid(min, math.inf, lambda key, value: value)
+MAX = Monoid(max, -math.inf, lambda key, value: value)
+
+
+class AugmentedAVLNode(AVLNode):
+    """Represents a node in an AugmentedAVLTree, which stores the aggregate
+    of the items in its subtree.
+
+    Subclasses set monoid; see AugmentedAVLTree.
+    """
+    __slots__ = ['aggregate']
+
+    monoid = SUM
+
+    def __init__(self, key, value=None):
+        """
+        Constructs an AugmentedAVLNode.
+
+        :param key: Orderable key (i.e. integer)
+        :param value: Optional value associated with key.
+        """
+        super().__init__(key, value)
+        self.aggregate = self.monoid.measure(key, value)
+
+    def update_height(self):
+        """
+        Updates the height and aggregate of the node according to its
+        children.
+        """
+        super().update_height()
+
+        combine, _, measure = self.monoid
+        aggregate = measure(self.key, self.value)
+
+        if self.left_child:
+            aggregate = combine(self.left_child.aggregate, aggregate)
+        if self.right_child:
+            aggregate = combine(aggregate, self.right_child.aggregate)
+
+        self.aggregate = aggregate
+
+    def copy(self):
+        node = super().copy()
+        node.aggregate = self.aggregate
+
+        return node
+
+
+@functools.lru_cache(maxsize=None)
+def _augmented_node_class(monoid):
+    """
+    :return: Subclass of AugmentedAVLNode aggregating with monoid.
+    """
+    return type('AugmentedAVLNode', (AugmentedAVLNode,),
+                {'__slots__': (), 'monoid': monoid})
+
+
+class AugmentedAVLTree(AVLTree):
+    """Represents an AVL tree, with optional values, whose nodes store an
+    aggregate (i.e. sum, count, min or max) of the items in their subtrees.
+
+    Aggregates are recomputed whenever heights are, so insertion & deletion
+    remain O(log n), and the aggregate of any range of keys is O(log n).
+
+    Items are aggregated with the class's monoid, the sum of values by
+    default. Subclasses set monoid to aggregate differently, or with_monoid
+    returns such a subclass, so that trees built by from_keys,
+    from_sorted_items and load aggregate the same way.
+    """
+    __slots__ = []
+
+    monoid = SUM
+    _node_class = AugmentedAVLNode
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._node_class = _augmented_node_class(cls.monoid)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def with_monoid(cls, monoid):
+        """
+        Returns a subclass of this class aggregating with monoid, the same
+        subclass for each monoid.
+
+        :param monoid: Monoid to aggregate items with.
+        :return: Subclass of this class.
+        """
+        return type(cls.__name__, (cls,), {'__slots__': (), 'monoid': monoid})
+
+    def get_monoid(self):
+        """
+        :return: The monoid aggregating this tree's items.
+        """
+        return self.monoid
+
+    @staticmethod
+    def _node_objects(node):
+        return node.key, node.value, node.aggregate
+
+    def aggregate(self, lo=None, hi=None):
+        """
+        Aggregates the items with keys in [lo, hi), in order of key.
+
+        :param lo: Smallest key to include. Defaults to unbounded.
+        :param hi: Key to stop at. Defaults to unbounded.
+        :return: Aggregate of items in range, or monoid's identity if none.
+        """
+        combine, identity, measure = self.monoid
+
+        def aggregate(node, lo, hi):
+            # Below the node where the paths to lo & hi diverge, one bound is
+            # None, so one of the two recursive calls returns immediately
+            while node is not None:
+                if lo is not None and node.key < lo:
+                    node = node.right_child
+                elif hi is not None and not node.key < hi:
+                    node = node.left_child
+                elif lo is None and hi is None:
+                    return node.aggregate
+                else:
+                    left = aggregate(node.left_child, lo, None)
+                    right = aggregate(node.right_child, None, hi)
+
+                    return combine(combine(left, measure(node.key,
+                                                         node.value)), right)
+
+            return identity
+
+        return aggregate(self._root, lo, hi)
+
+
+class AVLTreeStats:
+    """Represents counts of the work done by an InstrumentedAVLTree."""
+    __slots__ = ['operations', 'comparisons', 'single_rotations',
+                 'double_rotations', 'max_path_length', 'total_path_length']
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Resets all counts to zero.
+
+        :return: None
+        """
+        # Operation name -> count
+        self.operations = collections.Counter()
+        self.comparisons = collections.Counter()
+
+        self.single_rotations = 0
+        self.double_rotations = 0
+        self.max_path_length = 0
+        self.total_path_length = 0
+
+    def comparisons_per_operation(self, name=None):
+        """
+        :param name: Name of the operation, i.e. 'insert'. Defaults to all.
+        :return: Mean number of key comparisons per operation.
+        """
+        if name is None:
+            operations = sum(self.operations.values())
+            comparisons = sum(self.comparisons.values())
+        else:
+            operations = self.operations[name]
+            comparisons = self.comparisons[name]
+
+        return comparisons / operations if operations else 0
+
+    def average_path_length(self):
+        """
+        :return: Mean number of nodes visited to find each key.
+        """
+        operations = sum(self.operations.values())
+
+        return self.total_path_length / operations if operations else 0
+
+    def __repr__(self):
+        return ("AVLTreeStats(operations={}, comparisons={}, "
+                "single_rotations={}, double_rotations={}, "
+                "max_path_length={}, total_path_length={})").format(
+            sum(self.operations.values()), sum(self.comparisons.values()),
+            self.single_rotations, self.double_rotations,
+            self.max_path_length, self.total_path_length)
+
+
+class _CountingKey:
+    """Represents a key being searched for, which counts comparisons made
+    with it, and the nodes visited (each of which is first tested for
+    equality)."""
+    __slots__ = ['key', 'comparisons', 'visits', '_last_equal']
+
+    def __init__(self, key):
+        self.key = key
+        self.comparisons = 0
+        self.visits = 0
+        self._last_equal = self
+
+    def __eq__(self, other):
+        self.comparisons += 1
+
+        # A found node's key may be tested again, i.e. by __contains__
+        if other is not self._last_equal:
+            self.visits += 1
+            self._last_equal = other
+
+        return self.key == other
+
+    def __ne__(self, other):
+        self.comparisons += 1
+        return self.key != other
+
+    def __lt__(self, other):
+        self.comparisons += 1
+        return self.key < other
+
+    def __le__(self, other):
+        self.comparisons += 1
+        return self.key <= other
+
+    def __gt__(self, other):
+        self.comparisons += 1
+        return self.key > other
+
+    def __ge__(self, other):
+        self.comparisons += 1
+        return self.key >= other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.key)
+
+
+class InstrumentedAVLTree(AVLTree):
+    """Represents an AVL tree that counts its comparisons, rotations and
+    search path lengths, and calls hooks on rotation and rebalancing.
+
+    Counts are kept in the stats attribute. Operations are only
+    instrumented in this subclass, so AVLTree itself is unchanged.
+    """
+    __slots__ = ['stats', '_rotation_callbacks', '_rebalance_callbacks',
+                 '_rotations', '_counting_key']
+
+    def __init__(self, items=None):
+        """
+        Constructs InstrumentedAVLTree.
+
+        :param items: Optional iterable of key, value pairs to insert.
+        """
+        self.stats = AVLTreeStats()
+        self._rotation_callbacks = []
+        self._rebalance_callbacks = []
+        self._rotations = 0
+        self._counting_key = None
+
+        super().__init__(items)
+
+    def on_rotation(self, callback):
+        """
+        Registers a function to be called after each rotation.
+
+        :param callback: Called with the kind of rotation ('single_right',
+            'double_right', 'single_left' or 'double_left'), the node rotated
+            and the node that took its place.
+        :return: callback, so this can be used as a decorator.
+        """
+        self._rotation_callbacks.append(callback)
+        return callback
+
+    def on_rebalance(self, callback):
+        """
+        Registers a function to be called after the path changed by each
+        insertion or removal is rebalanced.
+
+        :param callback: Called with the list of nodes on the path, from the
+            root, and the number of rotations made.
+        :return: callback, so this can be used as a decorator.
+        """
+        self._rebalance_callbacks.append(callback)
+        return callback
+
+    def _search(self, name, operation, key, *args):
+        """
+        Runs an operation with a counting key, recording its counts.
+
+        :param name: Name of the operation, for stats.
+        :param operation: The AVLTree method to run.
+        :param key: The key to pass to operation.
+        :return: The result of operation.
+        """
+        counting_key = _CountingKey(key)
+        self._counting_key = counting_key
+        try:
+            return operation(self, counting_key, *args)
+        except KeyError:
+            raise KeyError(key) from None
+        finally:
+            self._counting_key = None
+
+            stats = self.stats
+            stats.operations[name] += 1
+            stats.comparisons[name] += counting_key.comparisons
+            stats.total_path_length += counting_key.visits
+            stats.max_path_length = max(stats.max_path_length,
+                                        counting_key.visits)
+
+            if operation is AVLTree.insert:
+                self._unwrap_key(counting_key)
+
+    def _unwrap_key(self, counting_key):
+        """
+        Replaces counting_key, stored by insert in a new node, with its key.
+
+        The new node is on the search path for its key, so is found by
+        following that path, comparing with the other (unwrapped) keys.
+
+        :return: None
+        """
+        key = counting_key.key
+        node = self._root
+
+        while node is not None:
+            if node.key is counting_key:
+                node.key = key
+                return
+
+            node = node.left_child if key < node.key else node.right_child
+
+    def _successor_node(self, key, root=None, stack=None):
+        counting_key = self._counting_key
+
+        if counting_key is None or isinstance(key, _CountingKey):
+            return super()._successor_node(key, root, stack)
+
+        # remove finds the node to replace a removed one by comparing keys
+        # in the tree, so count those comparisons too (though not as visits)
+        walk_key = _CountingKey(key)
+        try:
+            return super()._successor_node(walk_key, root, stack)
+        finally:
+            counting_key.comparisons += walk_key.comparisons
+
+    def insert(self, e, value=None):
+        return self._search('insert', AVLTree.insert, e, value)
+
+    def remove(self, e):
+        return self._search('remove', AVLTree.remove, e)
+
+    def predecessor(self, key):
+        return self._search('predecessor', AVLTree.predecessor, key)
+
+    def successor(self, key):
+        return self._search('successor', AVLTree.successor, key)
+
+    def __getitem__(self, key):
+        return self._search('__getitem__', AVLTree.__getitem__, key)
+
+    def __contains__(self, key):
+        return self._search('__contains__', AVLTree.__contains__, key)
+
+    def _balance_stack(self, nodes):
+        self._rotations = 0
+
+        super()._balance_stack(nodes)
+
+        for callback in self._rebalance_callbacks:
+            callback(nodes, self._rotations)
+
+    def _rotated(self, kind, node, new_node):
+        """
+        Records a rotation and calls the rotation callbacks.
+
+        :return: new_node
+        """
+        self._rotations += 1
+
+        if kind.startswith('single'):
+            self.stats.single_rotations += 1
+        else:
+            self.stats.double_rotations += 1
+
+        for callback in self._rotation_callbacks:
+            callback(kind, node, new_node)
+
+        return new_node
+
+    def _single_rotation_right(self, node):
+        return self._rotated('single_right', node,
+                             AVLTree._single_rotation_right(node))
+
+    def _double_rotation_right(self, node):
+        return self._rotated('double_right', node,
+                             AVLTree._double_rotation_right(node))
+
+    def _single_rotation_left(self, node):
+        return self._rotated('single_left', node,
+                             AVLTree._single_rotation_left(node))
+
+    def _double_rotation_left(self, node):
+        return self._rotated('double_left', node,
+                             AVLTree._double_rotation_left(node))
+
+
+class FingerAVLTree(AVLTree):
+    """Represents an AVL tree that remembers the path to the last key
+    searched for (a finger), and starts each search from the lowest node on
+    that path whose subtree could contain the key.
+
+    Searching for a key d positions from the last takes O(log d) time when
+    the keys searched for are sequential, amortized, but O(log n) in the
+    worst case (i.e. when the keys either side of the root alternate).
+    """
+    __slots__ = ['_finger']
+
+    def __init__(self, items=None):
+        """
+        Constructs FingerAVLTree.
+
+        :param items: Optional iterable of key, value pairs to insert.
+        """
+        # Path from the root, as (node, lo, hi) where lo & hi exclusively
+        # bound the keys in node's subtree, or are None if unbounded
+        self._finger = []
+
+        super().__init__(items)
+
+    def _finger_search(self, key):
+        """
+        Moves the finger to the node with key or, if there is none, to the
+        node that would be its parent.
+
+        :param key: Key to search for.
+        :return: Node with key, else None.
+        """
+        finger = self._finger
+
+        # Climb to the lowest node whose subtree could contain key
+        while finger:
+            node, lo, hi = finger.pop()
+
+            if (lo is None or lo < key) and (hi is None or key < hi):
+                break
+        else:
+            node, lo, hi = self._root, None, None
+
+        while node is not None:
+            finger.append((node, lo, hi))
+
+            if key == node.key:
+                return node
+            elif key < node.key:
+                node, hi = node.left_child, node.key
+            else:
+                node, lo = node.right_child, node.key
+
+        return None
+
+    def insert(self, e, value=None):
+        """
+        Inserts key into this FingerAVLTree, searching from the finger, or
+        replaces the value associated with key if it is already present.
+
+        :param e: Key to be inserted.
+        :param value: Optional value to be associated with key.
+        :return: None
+        """
+        if self._shared is not None:
+            self._unshare()
+            self._finger = []
+
+        node = self._finger_search(e)
+
+        if node is not None:
+            node.value = value
+            return
+
+        z = self._node_class(e, value)
+        self._length += 1
+
+        if not self._finger:
+            self._root = z
+            self._finger.append((z, None, None))
+            return
+
+        parent, lo, hi = self._finger[-1]
+
+        if e < parent.key:
+            parent.left_child = z
+            hi = parent.key
+        else:
+            parent.right_child = z
+            lo = parent.key
+
+        stack = [node for node, _, _ in self._finger]
+        self._balance_stack(stack)
+        self._finger = self._valid_finger(stack, z, lo, hi)
+
+    def _valid_finger(self, stack, z, lo, hi):
+        """
+        Rotations replace nodes on the path, but not the bounds of their
+        positions, so the finger is valid down to the first replaced node.
+
+        :return: The longest prefix of the path to z, from before rebalancing,
+            that is still a path from the root, extended to z if possible.
+        """
+        finger = self._finger
+        parent = None
+
+        for i, node in enumerate(stack):
+            if parent is None:
+                valid = node is self._root
+            else:
+                valid = node is parent.left_child or node is parent.right_child
+
+            if not valid:
+                return finger[:i]
+
+            parent = node
+
+        finger.append((z, lo, hi))
+
+        return finger
+
+    def remove(self, e):
+        # Removal may move keys between nodes, changing the bounds of the path
+        self._finger = []
+
+        return super().remove(e)
+
+    def __getitem__(self, key):
+        node = self._finger_search(key)
+        if node is None:
+            raise KeyError(key)
+
+        return node.value
+
+    def __contains__(self, key):
+        return self._finger_search(key) is not None
+
+
+class MultisetAVLTree(AVLTree):
+    """Represents a multiset of orderable keys, as an AVL tree with a node per
+    distinct key, whose value is the number of times the key occurs.
+
+    Adding another occurrence of a key increments its count, rather than
+    allocating a node, so operations are O(log d) for d distinct keys.
+    Iteration yields each key as many times as it occurs, in order.
+    """
+    __slots__ = ['_total']
+
+    def __init__(self, items=None):
+        """
+        Constructs MultisetAVLTree.
+
+        :param items: Optional iterable of key, count pairs to insert.
+        """
+        self._total = 0
+
+        super().__init__(items)
+
+    @classmethod
+    def from_keys(cls, keys, value=None):
+        """
+        Constructs a MultisetAVLTree from keys, which may repeat.
+
+        :param keys: Iterable of keys to add.
+        :param value: Unused, as each key's value is its count.
+        :return: Newly constructed MultisetAVLTree.
+        """
+        tree = cls()
+
+        for key in keys:
+            tree.add(key)
+
+        return tree
+
+    @classmethod
+    def _from_sorted_columns(cls, keys, values):
+        tree = super()._from_sorted_columns(keys, values)
+        tree._total = sum(values)
+
+        return tree
+
+    def _node(self, key):
+        """
+        :return: Node with key, else None.
+        """
+        node = self._successor_node(key)
+
+        if node is not None and node.key == key:
+            return node
+
+    def add(self, key, count=1):
+        """
+        Adds occurrences of key.
+
+        :param key: Key to add.
+        :param count: Number of occurrences to add.
+        :return: None
+
+        Raises:
+            ValueError: If count is less than 1.
+        """
+        if count < 1:
+            raise ValueError("Invalid count {!r}".format(count))
+
+        if self._shared is not None:
+            self._unshare()
+
+        node = self._node(key)
+
+        if node is not None:
+            node.value += count
+        else:
+            AVLTree.insert(self, key, count)
+
+        self._total += count
+
+    def discard_one(self, key):
+        """
+        Removes one occurrence of key, if any.
+
+        :param key: Key to remove.
+        :return: True iff an occurrence was removed.
+        """
+        if self._shared is not None:
+            self._unshare()
+
+        node = self._node(key)
+
+        if node is None:
+            return False
+
+        if node.value > 1:
+            node.value -= 1
+            self._total -= 1
+        else:
+            self.remove(key)
+
+        return True
+
+    def count(self, key):
+        """
+        :param key: Key to count.
+        :return: Number of occurrences of key.
+        """
+        node = self._node(key)
+
+        return node.value if node is not None else 0
+
+    def insert(self, e, value=1):
+        """
+        Sets the number of occurrences of key.
+
+        :param e: Key to be inserted.
+        :param value: Number of occurrences.
+        :return: None
+
+        Raises:
+            ValueError: If value is less than 1.
+        """
+        if value < 1:
+            raise ValueError("Invalid count {!r}".format(value))
+
+        self._total += value - self.count(e)
+
+        super().insert(e, value)
+
+    def remove(self, e):
+        """
+        Removes all occurrences of key.
+
+        :param e: The key to remove.
+        :return: Number of occurrences removed.
+        """
+        count = super().remove(e)
+        self._total -= count
+
+        return count
+
+    def distinct_count(self):
+        """
+        :return: Number of distinct keys.
+        """
+        return self._length
+
+    def copy(self, copy_on_write=False):
+        tree = super().copy(copy_on_write)
+        tree._total = self._total
+
+        return tree
+
+    def __len__(self):
+        return self._total
+
+    def __iter__(self):
+        for node in self.in_order_traversal():
+            for _ in range(node.value):
+                yield node.key
+
+    def __repr__(self):
+        return "MultisetAVLTree({!r})".format(tuple(self.items()))
+
 
 
 
@@ -0,0 +1,484 @@
+import io
+import random
+import sys
+import unittest
+
+from avl_tree import (AVLTree, AugmentedAVLTree, FingerAVLTree,
+                      InstrumentedAVLTree, MAX, MIN, MultisetAVLTree, SUM)
+
+
+class TestInstrumentedAVLTree(unittest.TestCase):
+    def test_missing_key(self):
+        tree = InstrumentedAVLTree((key, None) for key in range(10))
+
+        for operation in (tree.__getitem__, tree.remove):
+            with self.assertRaises(KeyError) as context:
+                operation(42)
+
+            self.assertEqual(context.exception.args, (42,))
+            self.assertIs(type(context.exception.args[0]), int)
+
+        self.assertEqual(tree.stats.operations['remove'], 1)
+
+    def test_single_rotations(self):
+        tree = InstrumentedAVLTree((key, None) for key in range(1, 8))
+
+        # Ascending inserts only ever make right-right imbalances
+        self.assertGreater(tree.stats.single_rotations, 0)
+        self.assertEqual(tree.stats.double_rotations, 0)
+        self.assertEqual(tree.height(), 3)
+
+    def test_double_rotations(self):
+        tree = InstrumentedAVLTree()
+        kinds = []
+        tree.on_rotation(lambda kind, node, new_node: kinds.append(
+            (kind, node.key, new_node.key)))
+
+        # Zig-zags: left then right of 3, and right then left of 3 again
+        for key in (3, 1, 2, 5, 4):
+            tree.insert(key)
+
+        self.assertEqual(kinds, [('double_right', 3, 2),
+                                 ('double_left', 3, 4)])
+        self.assertEqual(tree.stats.double_rotations, 2)
+        self.assertEqual(tree.stats.single_rotations, 0)
+
+    def test_callbacks(self):
+        tree = InstrumentedAVLTree()
+        rotations = []
+        rebalances = []
+
+        @tree.on_rotation
+        def rotated(kind, node, new_node):
+            self.assertIn(kind, ('single_right', 'double_right',
+                                 'single_left', 'double_left'))
+            self.assertIsNot(node, new_node)
+            rotations.append(kind)
+
+        self.assertTrue(callable(rotated))
+        tree.on_rebalance(lambda nodes, count: rebalances.append(
+            ([node.key for node in nodes], count)))
+
+        rng = random.Random(0)
+        keys = rng.sample(range(1000), 200)
+
+        for key in keys:
+            tree.insert(key)
+        for key in keys[:100]:
+            tree.remove(key)
+
+        stats = tree.stats
+        self.assertEqual(len(rotations),
+                         stats.single_rotations + stats.double_rotations)
+        self.assertEqual(sum(count for _, count in rebalances),
+                         len(rotations))
+
+        # Each insert (but the first, into an empty tree) and removal
+        # rebalances its path
+        self.assertEqual(len(rebalances), 299)
+        self.assertTrue(all(path for path, _ in rebalances))
+
+        self.assertLessEqual(tree.height(), 10)
+
+    def test_path_lengths(self):
+        tree = InstrumentedAVLTree()
+
+        for key in (3, 1, 2):
+            tree.insert(key)
+
+        # Visits none, then 3, then 3 & 1
+        stats = tree.stats
+        self.assertEqual(stats.operations['insert'], 3)
+        self.assertEqual(stats.total_path_length, 3)
+        self.assertEqual(stats.max_path_length, 2)
+        self.assertEqual(stats.average_path_length(), 1)
+
+        stats.reset()
+        self.assertEqual(stats.average_path_length(), 0)
+        self.assertEqual(stats.comparisons_per_operation(), 0)
+
+        # The root (2) is found on a path of 1, though its key is tested
+        # for equality twice
+        self.assertIn(2, tree)
+        self.assertEqual(stats.total_path_length, 1)
+        self.assertEqual(stats.comparisons_per_operation('__contains__'), 2)
+
+        self.assertIsNone(tree[1])
+        self.assertEqual(stats.total_path_length, 3)
+        self.assertEqual(stats.max_path_length, 2)
+        self.assertEqual(stats.average_path_length(), 1.5)
+        self.assertEqual(stats.comparisons_per_operation(),
+                         sum(stats.comparisons.values()) / 2)
+        self.assertEqual(stats.comparisons_per_operation('remove'), 0)
+
+    def test_keys_unwrapped(self):
+        tree = InstrumentedAVLTree((key, str(key)) for key in range(50))
+        tree.insert(25, 'again')
+
+        for node in tree.in_order_traversal():
+            self.assertIs(type(node.key), int)
+
+        self.assertEqual(list(tree.keys()), list(range(50)))
+        self.assertEqual(tree[25], 'again')
+
+    def test_remove_counts_successor_walk(self):
+        tree = InstrumentedAVLTree((key, None) for key in range(15))
+        root_key = tree._root.key
+
+        tree.stats.reset()
+        tree.remove(root_key)
+
+        # One comparison finds the root, then at least one per node walked
+        # to its successor, but only the root is visited by the search
+        self.assertGreater(tree.stats.comparisons['remove'], 3)
+        self.assertEqual(tree.stats.total_path_length, 1)
+        self.assertNotIn(root_key, tree)
+
+
+class TestCopyOnWrite(unittest.TestCase):
+    def setUp(self):
+        self.tree = AVLTree((key, str(key)) for key in range(20))
+
+    def test_copy(self):
+        copy = self.tree.copy()
+
+        self.assertIsNot(copy._root, self.tree._root)
+        self.assertEqual(list(copy.items()), list(self.tree.items()))
+        self.assertIsNone(copy._shared)
+
+        copy.insert(20)
+        self.assertNotIn(20, self.tree)
+
+    def test_snapshots(self):
+        tree = self.tree
+        first = tree.copy(copy_on_write=True)
+        second = tree.copy(copy_on_write=True)
+        third = first.copy(copy_on_write=True)
+
+        # All four trees share one root, and one counter
+        for snapshot in (first, second, third):
+            self.assertIs(snapshot._root, tree._root)
+            self.assertIs(snapshot._shared, tree._shared)
+
+        self.assertEqual(tree._shared, [4])
+
+        # Modifying a tree copies its nodes, leaving the others sharing
+        root = tree._root
+        tree.insert(20)
+        self.assertIsNone(tree._shared)
+        self.assertIsNot(tree._root, root)
+        self.assertEqual(first._shared, [3])
+
+        first.remove(0)
+        self.assertEqual(second._shared, [2])
+
+        second[5] = 'five'
+
+        # The last tree sharing the nodes takes them without copying
+        self.assertEqual(third._shared, [1])
+        third.insert(-1)
+        self.assertIs(third._root, root)
+        self.assertIsNone(third._shared)
+
+        self.assertEqual(list(tree.keys()), list(range(21)))
+        self.assertEqual(list(first.keys()), list(range(1, 20)))
+        self.assertEqual(second[5], 'five')
+        self.assertEqual(list(third.keys()), list(range(-1, 20)))
+
+        for snapshot in (tree, first, third):
+            self.assertEqual(snapshot[5], '5')
+
+    def test_snapshot_of_modified_tree(self):
+        snapshot = self.tree.copy(copy_on_write=True)
+        self.tree.remove(10)
+
+        # A tree that has stopped sharing starts a new counter
+        again = self.tree.copy(copy_on_write=True)
+        self.assertIsNot(again._shared, snapshot._shared)
+        self.assertEqual(again._shared, [2])
+        self.assertEqual(snapshot._shared, [1])
+
+        again.insert(10)
+        self.assertIn(10, again)
+        self.assertIn(10, snapshot)
+        self.assertNotIn(10, self.tree)
+
+
+class TestAugmentedAVLTree(unittest.TestCase):
+    def test_aggregate(self):
+        tree = AugmentedAVLTree((key, key) for key in range(10))
+
+        self.assertIs(tree.get_monoid(), SUM)
+        self.assertEqual(tree.aggregate(), 45)
+        self.assertEqual(tree.aggregate(2, 5), 9)
+
+        tree.insert(3, 30)
+        self.assertEqual(tree.aggregate(2, 5), 36)
+
+        tree.remove(4)
+        self.assertEqual(tree.aggregate(), 68)
+
+    def test_with_monoid(self):
+        max_tree = AugmentedAVLTree.with_monoid(MAX)
+
+        self.assertIs(max_tree, AugmentedAVLTree.with_monoid(MAX))
+        self.assertIsNot(max_tree, AugmentedAVLTree.with_monoid(MIN))
+        self.assertTrue(issubclass(max_tree, AugmentedAVLTree))
+
+        tree = max_tree((key, key % 7) for key in range(10))
+        self.assertIs(tree.get_monoid(), MAX)
+        self.assertEqual(tree.aggregate(), 6)
+        self.assertEqual(tree.aggregate(7, 10), 2)
+
+    def test_constructors_keep_monoid(self):
+        class MinTree(AugmentedAVLTree):
+            __slots__ = []
+            monoid = MIN
+
+        items = [(key, 10 - key) for key in range(10)]
+        stream = io.BytesIO()
+        MinTree(items).dump(stream)
+        stream.seek(0)
+
+        for tree, expected in ((MinTree.from_keys(range(10), 3), 3),
+                               (MinTree.from_sorted_items(items), 1),
+                               (MinTree.load(stream), 1),
+                               (MinTree(items).copy(), 1),
+                               (MinTree(items).copy(copy_on_write=True), 1)):
+            self.assertIs(type(tree), MinTree)
+            self.assertEqual(tree.aggregate(), expected)
+
+    def test_replace_value(self):
+        tree = AugmentedAVLTree.with_monoid(MAX)([(1, 5)])
+        tree.insert(1, 7)
+
+        self.assertEqual(len(tree), 1)
+        self.assertEqual(tree.aggregate(), 7)
+
+
+class TestFingerAVLTree(unittest.TestCase):
+    def check_finger(self, tree):
+        """
+        Checks the finger is a path from the root, with the bounds of each
+        node's position.
+        """
+        parent, parent_lo, parent_hi = None, None, None
+
+        for node, lo, hi in tree._finger:
+            if parent is None:
+                self.assertIs(node, tree._root)
+                self.assertEqual((lo, hi), (None, None))
+            elif node is parent.left_child:
+                self.assertEqual((lo, hi), (parent_lo, parent.key))
+            else:
+                self.assertIs(node, parent.right_child)
+                self.assertEqual((lo, hi), (parent.key, parent_hi))
+
+            parent, parent_lo, parent_hi = node, lo, hi
+
+    def test_finger_after_rotations(self):
+        rng = random.Random(0)
+        tree = FingerAVLTree()
+        keys = set()
+
+        for _ in range(2000):
+            key = rng.randrange(500)
+            operation = rng.random()
+
+            if operation < 0.5:
+                tree.insert(key, -key)
+                keys.add(key)
+            elif operation < 0.7 and key in keys:
+                self.assertEqual(tree.remove(key), -key)
+                keys.discard(key)
+            else:
+                self.assertEqual(key in tree, key in keys)
+
+            self.check_finger(tree)
+
+        # Ascending inserts rotate often, cutting the finger short of the new
+        # node, but not always
+        reached = 0
+
+        for key in range(1000, 1100):
+            tree.insert(key, -key)
+            keys.add(key)
+            self.check_finger(tree)
+            reached += bool(tree._finger) and tree._finger[-1][0].key == key
+
+        self.assertTrue(0 < reached < 100)
+        self.assertEqual(list(tree.keys()), sorted(keys))
+
+        for key in sorted(keys):
+            self.assertEqual(tree[key], -key)
+            self.check_finger(tree)
+
+    def test_copy_on_write(self):
+        tree = FingerAVLTree((key, None) for key in range(20))
+        snapshot = tree.copy(copy_on_write=True)
+
+        self.assertIn(5, tree)
+        tree.insert(20)
+        self.check_finger(tree)
+
+        self.assertIn(5, snapshot)
+        snapshot.insert(-1)
+        self.check_finger(snapshot)
+
+        self.assertNotIn(-1, tree)
+        self.assertNotIn(20, snapshot)
+
+
+class TestGetMany(unittest.TestCase):
+    def test_get_many(self):
+        tree = AVLTree((key, str(key)) for key in range(0, 100, 3))
+        keys = [-1, 0, 0, 2, 3, 50, 51, 99, 100]
+
+        self.assertEqual(tree.get_many(keys, 'missing'),
+                         [tree[key] if key in tree else 'missing'
+                          for key in keys])
+        self.assertEqual(tree.get_many([]), [])
+        self.assertEqual(AVLTree().get_many([1, 2]), [None, None])
+
+    def test_unsorted(self):
+        with self.assertRaises(ValueError):
+            AVLTree([(1, None)]).get_many([2, 1])
+
+
+class TestMultisetAVLTree(unittest.TestCase):
+    def setUp(self):
+        self.tree = MultisetAVLTree.from_keys([3, 1, 3, 2, 3, 1])
+
+    def test_counts(self):
+        tree = self.tree
+
+        self.assertEqual([tree.count(key) for key in range(5)],
+                         [0, 2, 1, 3, 0])
+        self.assertEqual(len(tree), 6)
+        self.assertEqual(tree.distinct_count(), 3)
+        self.assertEqual(list(tree), [1, 1, 2, 3, 3, 3])
+        self.assertEqual(list(tree.items()), [(1, 2), (2, 1), (3, 3)])
+
+    def test_add(self):
+        tree = self.tree
+        tree.add(2, 4)
+        tree.add(0)
+
+        self.assertEqual(tree.count(2), 5)
+        self.assertEqual(tree.count(0), 1)
+        self.assertEqual(len(tree), 11)
+        self.assertEqual(tree.distinct_count(), 4)
+
+    def test_discard_one(self):
+        tree = self.tree
+
+        # Decrements a repeated key's count, keeping its node
+        self.assertTrue(tree.discard_one(3))
+        self.assertEqual(tree.count(3), 2)
+        self.assertEqual(tree.distinct_count(), 3)
+
+        # Removes the node of a key occurring once
+        self.assertTrue(tree.discard_one(2))
+        self.assertNotIn(2, tree)
+        self.assertEqual(tree.distinct_count(), 2)
+
+        self.assertFalse(tree.discard_one(2))
+        self.assertEqual(len(tree), 4)
+        self.assertEqual(list(tree), [1, 1, 3, 3])
+
+    def test_remove(self):
+        self.assertEqual(self.tree.remove(3), 3)
+        self.assertEqual(len(self.tree), 3)
+        self.assertEqual(self.tree.distinct_count(), 2)
+
+        with self.assertRaises(KeyError):
+            self.tree.remove(3)
+
+        self.assertEqual(len(self.tree), 3)
+
+    def test_insert_sets_count(self):
+        tree = self.tree
+        tree.insert(3, 1)
+        tree.insert(4)
+        tree[5] = 2
+
+        self.assertEqual(list(tree), [1, 1, 2, 3, 4, 5, 5])
+        self.assertEqual(len(tree), 7)
+
+    def test_invalid_counts(self):
+        for count in (0, -1):
+            with self.assertRaises(ValueError):
+                self.tree.add(1, count)
+            with self.assertRaises(ValueError):
+                self.tree.insert(1, count)
+
+        self.assertEqual(self.tree.count(1), 2)
+        self.assertEqual(len(self.tree), 6)
+
+    def test_copy_on_write(self):
+        snapshot = self.tree.copy(copy_on_write=True)
+        self.tree.add(1)
+        self.tree.discard_one(2)
+
+        self.assertEqual(len(snapshot), 6)
+        self.assertEqual(list(snapshot), [1, 1, 2, 3, 3, 3])
+        self.assertEqual(len(self.tree), 6)
+        self.assertEqual(list(self.tree), [1, 1, 1, 3, 3, 3])
+
+        snapshot.discard_one(3)
+        self.assertEqual(snapshot.count(3), 2)
+        self.assertEqual(self.tree.count(3), 3)
+
+    def test_sorted_constructors(self):
+        stream = io.BytesIO()
+        self.tree.dump(stream)
+        stream.seek(0)
+
+        for tree in (MultisetAVLTree.load(stream),
+                     MultisetAVLTree.from_sorted_items(self.tree.items())):
+            self.assertIs(type(tree), MultisetAVLTree)
+            self.assertEqual(len(tree), 6)
+            self.assertEqual(tree.distinct_count(), 3)
+            self.assertEqual(list(tree), list(self.tree))
+
+
+class TestMemoryUsage(unittest.TestCase):
+    def test_empty(self):
+        tree = AVLTree()
+
+        self.assertEqual(tree.memory_usage(), sys.getsizeof(tree))
+        self.assertEqual(tree.memory_usage(deep=False), sys.getsizeof(tree))
+
+    def test_shallow(self):
+        tree = AVLTree((key, None) for key in range(100))
+
+        self.assertEqual(tree.memory_usage(deep=False),
+                         sys.getsizeof(tree) + sum(
+                             sys.getsizeof(node)
+                             for node in tree.in_order_traversal()))
+
+    def test_deep(self):
+        keys = [str(key) * 10 for key in range(100)]
+        value = 'shared ' * 100
+        tree = AVLTree((key, value) for key in keys)
+        self.assertLess(tree.memory_usage(deep=False), tree.memory_usage())
+
+        # The shared value is counted once
+        self.assertEqual(tree.memory_usage() - tree.memory_usage(deep=False),
+                         sum(map(sys.getsizeof, keys)) +
+                         sys.getsizeof(value))
+
+    def test_aggregates(self):
+        tree = AugmentedAVLTree((key, key + 0.5) for key in range(100))
+        nodes = list(tree.in_order_traversal())
+        objects = {id(obj): obj for node in nodes
+                   for obj in (node.key, node.value, node.aggregate)}
+
+        # A leaf's aggregate is its value, so is not counted again
+        self.assertLess(len(objects), 300)
+        self.assertEqual(tree.memory_usage() - tree.memory_usage(deep=False),
+                         sum(map(sys.getsizeof, objects.values())))
+
+
+if __name__ == '__main__':
+    unittest.main()
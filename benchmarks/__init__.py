@@ -0,0 +1,18 @@
+"""
+Benchmarks for the data structures and algorithms in this repository.
+
+Run with:
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json
+    python -m benchmarks.memory --sizes 1000 10000 100000
+
+See benchmarks/__main__.py for options.
+"""
+
+import os
+import sys
+
+# Peak finders are not in a package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'mit-6006f11', '01_peaks'))
@@ -0,0 +1,91 @@
+"""
+Usage:
+
+    python -m benchmarks run [--sizes N ...] [--filter NAME] [--repeat R]
+                             [--warmup W] [--seed S] [--output PATH]
+                             [--baseline PATH] [--threshold T]
+    python -m benchmarks compare BASELINE CURRENT [--threshold T]
+
+Comparisons exit with status 1 if any benchmark is slower than its baseline
+by more than the threshold (a fraction, i.e. 0.1 for 10%).
+"""
+
+import argparse
+import sys
+
+from benchmarks import runner, suite
+
+
+def print_result(result):
+    print("{:<45} {:>9} {:<15} {:>12.1f} ns/op".format(
+        result['name'], result['size'], result['workload'],
+        result['ns_per_op']))
+
+
+def print_comparison(rows, threshold):
+    """
+    Prints rows from runner.compare, marking regressions.
+
+    :return: Number of regressions.
+    """
+    regressions = 0
+
+    for (name, size, workload), before, after, ratio in rows:
+        regressed = ratio > 1 + threshold
+        regressions += regressed
+
+        print("{:<45} {:>9} {:<15} {:>10.6f}s {:>10.6f}s {:>7.2f}x{}".format(
+            name, size, workload, before, after, ratio,
+            "  REGRESSION" if regressed else ""))
+
+    print("{} of {} benchmarks regressed by more than {:.0%}".format(
+        regressions, len(rows), threshold))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run benchmarks")
+    run.add_argument('--sizes', type=int, nargs='+',
+                     default=[1000, 10000, 100000])
+    run.add_argument('--filter', default='',
+                     help="only run benchmarks whose name contains this")
+    run.add_argument('--repeat', type=int, default=5)
+    run.add_argument('--warmup', type=int, default=1)
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--output', help="path to save results as JSON")
+    run.add_argument('--baseline', help="path of results to compare with")
+    run.add_argument('--threshold', type=float, default=0.1)
+
+    compare = commands.add_parser('compare', help="compare saved results")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = runner.run(suite.BENCHMARKS, args.sizes, args.repeat,
+                            args.warmup, args.seed, args.filter, print_result)
+
+        if args.output:
+            runner.save(report, args.output)
+
+        if not args.baseline:
+            return 0
+
+        baseline = runner.load(args.baseline)
+    else:
+        baseline = runner.load(args.baseline)
+        report = runner.load(args.current)
+
+    rows = runner.compare(baseline, report, args.threshold)
+
+    return 1 if print_comparison(rows, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
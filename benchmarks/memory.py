@@ -0,0 +1,88 @@
+"""
+Reports the memory used per element by each backend, measured by tracemalloc
+while the backend is built, alongside the backend's own memory_usage().
+
+Run with:
+
+    python -m benchmarks.memory [--sizes 1000 10000 ...] [--seed S]
+
+Sizes default to 1e3 to 1e7; the largest take minutes and gigabytes.
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from avl_tree import AVLTree
+from binary_heap import PriorityQueue
+from workload import Workload
+
+DEFAULT_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)
+
+
+def build_avl_tree(keys):
+    return AVLTree.from_keys(keys)
+
+
+def build_priority_queue(keys):
+    heap = PriorityQueue()
+
+    for key in keys:
+        heap.insert(key)
+
+    return heap
+
+
+BACKENDS = (
+    ('AVLTree', build_avl_tree),
+    ('PriorityQueue', build_priority_queue),
+)
+
+
+def measure(build, keys):
+    """
+    Builds a backend from keys, tracing the memory allocated.
+
+    Keys are allocated before tracing starts, so are not included.
+
+    :param build: Function of keys, returning the backend.
+    :param keys: List of keys.
+    :return: Tuple of bytes allocated and still in use, and the backend.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        backend = build(keys)
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return size, backend
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memory")
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=list(DEFAULT_SIZES))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print("{:<15} {:>9} {:>14} {:>14} {:>14}".format(
+        "backend", "n", "traced B/elem", "shallow B/elem", "deep B/elem"))
+
+    for n in args.sizes:
+        keys = list(Workload(args.seed).unique_keys(n, 4 * n))
+
+        for name, build in BACKENDS:
+            traced, backend = measure(build, keys)
+
+            print("{:<15} {:>9} {:>14.1f} {:>14.1f} {:>14.1f}".format(
+                name, n, traced / n, backend.memory_usage(deep=False) / n,
+                backend.memory_usage() / n))
+
+            del backend
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+
+def measure(prepare, repeat=5, warmup=1):
+    """
+    Times a benchmark, excluding the time taken to prepare it.
+
+    :param prepare: Returns a fresh zero argument callable to time, each time
+        it is called.
+    :param repeat: Number of timed repetitions.
+    :param warmup: Number of untimed repetitions to run first.
+    :return: List of seconds taken by each timed repetition.
+    """
+    times = []
+
+    for i in range(warmup + repeat):
+        run = prepare()
+
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+
+        if i >= warmup:
+            times.append(elapsed)
+
+    return times
+
+
+def metadata():
+    """
+    :return: Dictionary describing the machine, Python and source revision.
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': sys.version,
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit or None,
+    }
+
+
+def result_key(result):
+    """
+    :return: Tuple identifying a result, for matching against a baseline.
+    """
+    return result['name'], result['size'], result['workload']
+
+
+def run(benchmarks, sizes, repeat=5, warmup=1, seed=0, name_filter='',
+        log=None):
+    """
+    Runs benchmarks on each size and workload.
+
+    :param benchmarks: Iterable of suite.Benchmark.
+    :param sizes: Iterable of sizes, n.
+    :param repeat: Number of timed repetitions.
+    :param warmup: Number of untimed repetitions.
+    :param seed: Seed for workloads.
+    :param name_filter: Only run benchmarks whose name contains this.
+    :param log: Called with each result as it is recorded, if given.
+    :return: Dictionary of metadata and results, ready to be saved as JSON.
+    """
+    results = []
+
+    for benchmark in benchmarks:
+        if name_filter not in benchmark.name:
+            continue
+
+        for size in sizes:
+            for workload in benchmark.workloads:
+                ops, prepare = benchmark.setup(size, workload, seed)
+                times = measure(prepare, repeat, warmup)
+
+                result = {
+                    'name': benchmark.name,
+                    'size': size,
+                    'workload': workload,
+                    'ops': ops,
+                    'times': times,
+                    'min': min(times),
+                    'median': statistics.median(times),
+                    'ns_per_op': min(times) / ops * 1e9,
+                }
+                results.append(result)
+
+                if log:
+                    log(result)
+
+    return {
+        'metadata': dict(metadata(), repeat=repeat, warmup=warmup, seed=seed),
+        'results': results,
+    }
+
+
+def save(report, path):
+    """
+    Saves a report from run as JSON.
+
+    :return: None
+    """
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path):
+    """
+    :return: Report saved with save.
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compares the fastest time of each result with a baseline.
+
+    :param baseline: Report from run.
+    :param current: Report from run.
+    :param threshold: Fraction by which a result may be slower than its
+        baseline before it is a regression.
+    :return: List of (result key, baseline seconds, current seconds, ratio),
+        for results present in both reports, with the regressions last.
+    """
+    baseline_results = {result_key(result): result
+                        for result in baseline['results']}
+    rows = []
+
+    for result in current['results']:
+        key = result_key(result)
+
+        if key not in baseline_results:
+            continue
+
+        before = baseline_results[key]['min']
+        rows.append((key, before, result['min'], result['min'] / before))
+
+    rows.sort(key=lambda row: row[3] > 1 + threshold)
+
+    return rows
@@ -0,0 +1,274 @@
+"""
+Benchmarks of each public operation.
+
+Each benchmark has a setup function, taking a size n, a workload name and a
+seed, and returning the number of operations timed and a function that
+prepares a fresh run. Preparation (i.e. building a tree to remove from) is
+not timed.
+"""
+
+import collections
+
+from avl_tree import AVLTree
+from binary_heap import PriorityQueue
+from binary_search import binary_search, binary_search_selector, \
+    interpolation_search, exponential_search, search, SelectorIndex
+from learned_index import LearnedIndex
+from workload import Workload
+import peak_1d
+import peak_2d
+
+Benchmark = collections.namedtuple('Benchmark', ['name', 'workloads', 'setup'])
+
+# Orders of distinct keys to insert
+INSERT_WORKLOADS = ('unique', 'sorted', 'reverse_sorted', 'nearly_sorted',
+                    'adversarial')
+
+# Distributions of keys to query
+QUERY_WORKLOADS = ('unique', 'zipf')
+
+# Inputs to peak finders: random, or increasing towards the last cell
+PEAK_WORKLOADS = ('unique', 'sorted')
+
+BENCHMARKS = []
+
+
+def benchmark(name, workloads):
+    """
+    Registers a setup function as a benchmark.
+    """
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, workloads, setup))
+        return setup
+
+    return register
+
+
+def insert_keys(n, workload, seed):
+    """
+    :return: List of n distinct keys, in the workload's order.
+    """
+    return list(Workload(seed).keys(workload, n))
+
+
+def sorted_keys(n, seed):
+    """
+    :return: Sorted list of n distinct keys.
+    """
+    return list(Workload(seed).sorted_keys(n, 4 * n))
+
+
+def query_keys(keys, workload, seed):
+    """
+    :return: List of len(keys) keys from keys, chosen by the workload.
+    """
+    n = len(keys)
+
+    if workload == 'zipf':
+        positions = Workload(seed + 1).zipf_keys(n, n)
+    else:
+        positions = Workload(seed + 1).unique_keys(n, n)
+
+    return [keys[i] for i in positions]
+
+
+def peak_input_1d(n, workload, seed):
+    """
+    :return: List of n numbers, random or increasing.
+    """
+    if workload == 'sorted':
+        return list(range(n))
+
+    return list(Workload(seed).unique_keys(n, 4 * n))
+
+
+def peak_input_2d(n, workload, seed):
+    """
+    :return: sqrt(n)xsqrt(n) matrix, random or increasing.
+    """
+    side = max(int(n ** 0.5), 1)
+    nums = peak_input_1d(side * side, workload, seed)
+
+    return [nums[i:i + side] for i in range(0, side * side, side)]
+
+
+# AVLTree
+
+@benchmark('avl_tree.insert', INSERT_WORKLOADS)
+def avl_insert(n, workload, seed):
+    keys = insert_keys(n, workload, seed)
+
+    def prepare():
+        tree = AVLTree()
+        return lambda: [tree.insert(key) for key in keys]
+
+    return n, prepare
+
+
+@benchmark('avl_tree.from_keys', INSERT_WORKLOADS)
+def avl_from_keys(n, workload, seed):
+    keys = insert_keys(n, workload, seed)
+
+    return n, lambda: lambda: AVLTree.from_keys(keys)
+
+
+@benchmark('avl_tree.remove', INSERT_WORKLOADS)
+def avl_remove(n, workload, seed):
+    keys = insert_keys(n, workload, seed)
+
+    def prepare():
+        tree = AVLTree.from_keys(keys)
+        return lambda: [tree.remove(key) for key in keys]
+
+    return n, prepare
+
+
+def avl_query(operation):
+    """
+    :return: Setup function timing operation(tree, key) for each query.
+    """
+    def setup(n, workload, seed):
+        keys = sorted_keys(n, seed)
+        tree = AVLTree.from_keys(keys)
+        queries = query_keys(keys, workload, seed)
+
+        return n, lambda: lambda: [operation(tree, key) for key in queries]
+
+    return setup
+
+
+benchmark('avl_tree.__getitem__', QUERY_WORKLOADS)(
+    avl_query(AVLTree.__getitem__))
+benchmark('avl_tree.__contains__', QUERY_WORKLOADS)(
+    avl_query(AVLTree.__contains__))
+benchmark('avl_tree.predecessor', QUERY_WORKLOADS)(
+    avl_query(AVLTree.predecessor))
+benchmark('avl_tree.successor', QUERY_WORKLOADS)(
+    avl_query(AVLTree.successor))
+
+
+@benchmark('avl_tree.items', ('unique',))
+def avl_items(n, workload, seed):
+    tree = AVLTree.from_keys(insert_keys(n, workload, seed))
+
+    return n, lambda: lambda: list(tree.items())
+
+
+@benchmark('avl_tree.copy', ('unique',))
+def avl_copy(n, workload, seed):
+    tree = AVLTree.from_keys(insert_keys(n, workload, seed))
+
+    return n, lambda: tree.copy
+
+
+# PriorityQueue
+
+@benchmark('binary_heap.insert', INSERT_WORKLOADS)
+def heap_insert(n, workload, seed):
+    keys = insert_keys(n, workload, seed)
+
+    def prepare():
+        heap = PriorityQueue()
+        return lambda: [heap.insert(key) for key in keys]
+
+    return n, prepare
+
+
+@benchmark('binary_heap.delete_min', INSERT_WORKLOADS)
+def heap_delete_min(n, workload, seed):
+    keys = insert_keys(n, workload, seed)
+
+    def prepare():
+        heap = PriorityQueue((key, None) for key in keys)
+        return lambda: [heap.delete_min() for _ in keys]
+
+    return n, prepare
+
+
+@benchmark('binary_heap.items', ('unique',))
+def heap_items(n, workload, seed):
+    heap = PriorityQueue((key, None) for key in insert_keys(n, workload, seed))
+
+    return n, lambda: lambda: list(heap.items())
+
+
+@benchmark('binary_heap.copy', ('unique',))
+def heap_copy(n, workload, seed):
+    heap = PriorityQueue((key, None) for key in insert_keys(n, workload, seed))
+
+    return n, lambda: heap.copy
+
+
+# Binary search
+
+def search_query(method):
+    """
+    :return: Setup function timing method(key, keys) for each query.
+    """
+    def setup(n, workload, seed):
+        keys = sorted_keys(n, seed)
+        queries = query_keys(keys, workload, seed)
+
+        return n, lambda: lambda: [method(key, keys) for key in queries]
+
+    return setup
+
+
+benchmark('binary_search.binary_search', QUERY_WORKLOADS)(
+    search_query(binary_search))
+benchmark('binary_search.interpolation_search', QUERY_WORKLOADS)(
+    search_query(interpolation_search))
+benchmark('binary_search.exponential_search', QUERY_WORKLOADS)(
+    search_query(exponential_search))
+benchmark('binary_search.search', QUERY_WORKLOADS)(
+    search_query(search))
+benchmark('binary_search.binary_search_selector', QUERY_WORKLOADS)(
+    search_query(lambda key, keys: binary_search_selector(key, keys)))
+
+
+@benchmark('binary_search.SelectorIndex.index', QUERY_WORKLOADS)
+def selector_index(n, workload, seed):
+    keys = sorted_keys(n, seed)
+    index = SelectorIndex(keys)
+    index.get_keys()
+    queries = query_keys(keys, workload, seed)
+
+    return n, lambda: lambda: [index.index(key) for key in queries]
+
+
+@benchmark('learned_index.LearnedIndex.index', QUERY_WORKLOADS)
+def learned_index(n, workload, seed):
+    keys = sorted_keys(n, seed)
+    index = LearnedIndex(keys)
+    queries = query_keys(keys, workload, seed)
+
+    return n, lambda: lambda: [index.index(key) for key in queries]
+
+
+# Peak finders
+
+def peak_finder(method, make_input):
+    """
+    :return: Setup function timing a single call of method.
+    """
+    def setup(n, workload, seed):
+        nums = make_input(n, workload, seed)
+
+        return 1, lambda: lambda: method(nums)
+
+    return setup
+
+
+for method in (peak_1d.find_1d_peak_naive, peak_1d.find_1d_peak_binary):
+    benchmark('peak_1d.' + method.__name__, PEAK_WORKLOADS)(
+        peak_finder(method, peak_input_1d))
+
+benchmark('peak_1d.stream_1d_peaks', PEAK_WORKLOADS)(
+    peak_finder(lambda nums: next(peak_1d.stream_1d_peaks(nums)),
+                peak_input_1d))
+
+for method in (peak_2d.find_2d_peak_greedy, peak_2d.find_2d_peak_linear_binary,
+               peak_2d.find_2d_peak_halving, peak_2d.find_2d_peak_window,
+               peak_2d.find_2d_peak_basins):
+    benchmark('peak_2d.' + method.__name__, PEAK_WORKLOADS)(
+        peak_finder(method, peak_input_2d))
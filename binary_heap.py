@@ -1,3 +1,8 @@
+import sys
+
+import serialization
+
+
 class BinaryHeapNode:
     """Represents a node in an Binary Heap"""
     __slots__ = ['index', 'key', 'value']
@@ -23,11 +28,17 @@ class BinaryHeapNode:
 class PriorityQueue:
     """Represents a PriorityQueue on a set of items with unique, orderable keys,
     implemented with a dynamic array (list)."""
-    __slots__ = ['_nodes']
+    __slots__ = ['_nodes', '_shared']
+
+    # Identifies dumps of PriorityQueues
+    MAGIC = b'PQ01'
 
     def __init__(self, items=None):
         self._nodes = []
 
+        # Count of queues sharing nodes with this one (see copy), if any
+        self._shared = None
+
         if items:
             for key, value in items:
                 self.insert(key, value)
@@ -40,6 +51,45 @@ class PriorityQueue:
 
         return heap
 
+    def dump(self, fileobj):
+        """
+        Writes the items of this PriorityQueue, in heap order, to a binary
+        file.
+
+        Keys and values are each stored as a column; a column of ints
+        (within 64 bits) or floats is packed as an array, others are pickled.
+
+        :param fileobj: Binary file opened for writing.
+        :return: None
+        """
+        serialization.dump_columns(fileobj, self.MAGIC,
+                                   [node.key for node in self._nodes],
+                                   [node.value for node in self._nodes])
+
+    @classmethod
+    def load(cls, fileobj, use_mmap=False):
+        """
+        Constructs a PriorityQueue from a dump, restoring its array directly,
+        in O(n) time.
+
+        :param fileobj: Binary file opened for reading, positioned at a dump.
+        :param use_mmap: If True, reads the dump from a memory map of
+            fileobj, rather than copying it into memory first.
+        :return: Newly constructed PriorityQueue.
+
+        Raises:
+            ValueError: If fileobj is not positioned at a dump of a
+                PriorityQueue.
+        """
+        keys, values = serialization.load_columns(fileobj, cls.MAGIC,
+                                                  use_mmap)
+
+        heap = cls()
+        heap._nodes = [BinaryHeapNode(key, value)
+                       for key, value in zip(keys, values)]
+
+        return heap
+
     def get_root(self):
         """
         :return: The root node.
@@ -204,18 +254,74 @@ class PriorityQueue:
         for node, depth in self.in_order_traversal():
             yield node.key, node.value
 
-    def copy(self):
+    def memory_usage(self, deep=True):
+        """
+        Returns the number of bytes used by this PriorityQueue, its list
+        (including over-allocated capacity) and its nodes.
+
+        :param deep: Whether to include keys and values. Each distinct key or
+            value object is counted once, shallowly (as by sys.getsizeof).
+        :return: Number of bytes.
+        """
+        size = sys.getsizeof(self) + sys.getsizeof(self._nodes)
+        seen = set()
+
+        for node in self._nodes:
+            size += sys.getsizeof(node)
+
+            if deep:
+                for obj in (node.key, node.value):
+                    if id(obj) not in seen:
+                        seen.add(id(obj))
+                        size += sys.getsizeof(obj)
+
+        return size
+
+    def copy(self, copy_on_write=False):
         """
-        Returns a deepcopy of this PriorityQueue.
+        Returns a copy of this PriorityQueue, with new nodes in the same
+        order, in O(n) time.
+
+        Keys and values are not copied.
+
+        :param copy_on_write: If True, the copy shares this queue's nodes,
+            taking O(1) time, until either queue is modified, when the
+            modified queue first copies them.
         :return: New PriorityQueue.
         """
+        heap = self.__class__()
+
+        if copy_on_write:
+            if self._shared is None:
+                self._shared = [1]
+
+            self._shared[0] += 1
+            heap._shared = self._shared
+            heap._nodes = self._nodes
+        else:
+            heap._nodes = self._copy_nodes()
+
+        return heap
+
+    def _copy_nodes(self):
+        """
+        :return: List of new nodes with the keys & values of this queue's.
+        """
+        return [BinaryHeapNode(node.key, node.value) for node in self._nodes]
 
-        tree = PriorityQueue()
+    def _unshare(self):
+        """
+        Stops sharing nodes with copy-on-write copies, copying the nodes
+        unless no other queue still shares them.
 
-        for node in self.level_order_traversal():
-            tree._nodes.append(node)
+        :return: None
+        """
+        self._shared[0] -= 1
+
+        if self._shared[0] > 0:
+            self._nodes = self._copy_nodes()
 
-        return tree
+        self._shared = None
 
     def __len__(self):
         return len(self._nodes)
@@ -224,7 +330,7 @@ class PriorityQueue:
         yield from self.keys()
 
     def __repr__(self):
-        return "PriorityQueue({!r})".format(tuple(node.key for node in self))
+        return "PriorityQueue({!r})".format(tuple(self.keys()))
 
     def __str__(self):
         if self._nodes:
@@ -233,6 +339,9 @@ class PriorityQueue:
             return "<empty>"
 
     def insert(self, key, value=None):
+        if self._shared is not None:
+            self._unshare()
+
         i = len(self._nodes)
         self._nodes.append(BinaryHeapNode(key, value))
 
@@ -250,11 +359,14 @@ class PriorityQueue:
                 i = parent_i
 
     def delete_min(self):
+        if self._shared is not None:
+            self._unshare()
+
         root = self._nodes[0]
 
         rightmost_leaf = self._nodes.pop(-1)
 
-        if len(self._nodes) > 1:
+        if self._nodes:
             self._nodes[0] = rightmost_leaf
 
             i = 0
@@ -0,0 +1,80 @@
+import sys
+import unittest
+
+from binary_heap import PriorityQueue
+
+
+class TestCopyOnWrite(unittest.TestCase):
+    def setUp(self):
+        self.queue = PriorityQueue((key, str(key)) for key in range(10))
+
+    def test_copy(self):
+        copy = self.queue.copy()
+
+        self.assertIsNot(copy._nodes, self.queue._nodes)
+        self.assertEqual(list(copy.items()), list(self.queue.items()))
+        self.assertIsNone(copy._shared)
+
+        copy.delete_min()
+        self.assertEqual(len(self.queue), 10)
+
+    def test_snapshots(self):
+        queue = self.queue
+        first = queue.copy(copy_on_write=True)
+        second = first.copy(copy_on_write=True)
+
+        for snapshot in (first, second):
+            self.assertIs(snapshot._nodes, queue._nodes)
+            self.assertIs(snapshot._shared, queue._shared)
+
+        self.assertEqual(queue._shared, [3])
+
+        nodes = queue._nodes
+        queue.delete_min()
+        self.assertIsNot(queue._nodes, nodes)
+        self.assertIsNone(queue._shared)
+        self.assertEqual(first._shared, [2])
+
+        first.insert(-1)
+        self.assertIsNot(first._nodes, nodes)
+
+        # The last queue sharing the nodes takes them without copying
+        self.assertEqual(second._shared, [1])
+        second.insert(10)
+        self.assertIs(second._nodes, nodes)
+        self.assertIsNone(second._shared)
+
+        self.assertEqual(sorted(queue.keys()), list(range(1, 10)))
+        self.assertEqual(sorted(first.keys()), list(range(-1, 10)))
+        self.assertEqual(sorted(second.keys()), list(range(11)))
+
+
+class TestMemoryUsage(unittest.TestCase):
+    def test_empty(self):
+        queue = PriorityQueue()
+        size = sys.getsizeof(queue) + sys.getsizeof(queue._nodes)
+
+        self.assertEqual(queue.memory_usage(), size)
+        self.assertEqual(queue.memory_usage(deep=False), size)
+
+    def test_shallow(self):
+        queue = PriorityQueue((key, None) for key in range(100))
+
+        # Includes the list's over-allocated capacity
+        self.assertEqual(queue.memory_usage(deep=False),
+                         sys.getsizeof(queue) + sys.getsizeof(queue._nodes) +
+                         sum(map(sys.getsizeof, queue._nodes)))
+
+    def test_deep(self):
+        keys = [str(key) * 10 for key in range(100)]
+        value = 'shared ' * 100
+        queue = PriorityQueue((key, value) for key in keys)
+
+        self.assertLess(queue.memory_usage(deep=False), queue.memory_usage())
+        self.assertEqual(
+            queue.memory_usage() - queue.memory_usage(deep=False),
+            sum(map(sys.getsizeof, keys)) + sys.getsizeof(value))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,23 @@
-def binary_search(key, keys):
+from array import array
+import mmap
+import os
+import struct
+
+
+def binary_search(key, keys, left=0, right=None):
     """
     Performs binary search.
 
     :param key: Key to search for.
     :param keys: Sorted iterable of keys.
+    :param left: Lowest index to consider. Defaults to 0.
+    :param right: Highest index to consider. Defaults to len(keys) - 1.
     :return: An index of key, else -1 if not found.
     """
-    left = 0
-    right = len(keys) - 1
+    if right is None:
+        right = len(keys) - 1
 
-    while left != right:
+    while left <= right:
         mid = (left + right) // 2
 
         if keys[mid] == key:
@@ -34,7 +42,7 @@ def binary_search_selector(key, items, selector=lambda item: item):
     left = 0
     right = len(items) - 1
 
-    while left != right:
+    while left <= right:
         mid = (left + right) // 2
 
         this_key = selector(items[mid])
@@ -49,6 +57,530 @@ def binary_search_selector(key, items, selector=lambda item: item):
     return -1
 
 
+def _compact_keys(keys):
+    """
+    Packs keys into a typed array if they are all ints or all floats.
+
+    :param keys: List of keys.
+    :return: array.array of keys if possible, else keys.
+    """
+    if keys and all(type(key) is int for key in keys):
+        try:
+            return array('q', keys)
+        except OverflowError:
+            return keys
+
+    if keys and all(type(key) is float for key in keys):
+        return array('d', keys)
+
+    return keys
+
+
+class SelectorIndex:
+    """Binary searches items by a selected key, without applying the selector
+    on each probe.
+
+    Keys are selected from every item once, on first lookup, and cached in a
+    compact array. If items is modified, refresh must be called.
+    """
+    __slots__ = ['_items', '_selector', '_keys']
+
+    def __init__(self, items, selector=lambda item: item):
+        """
+        Constructs a SelectorIndex.
+
+        :param items: Sorted sequence of items.
+        :param selector: Returns key when applied to item.
+        """
+        self._items = items
+        self._selector = selector
+        self._keys = None
+
+    def refresh(self):
+        """
+        Invalidates the cached keys, so that they are selected again from
+        items on next lookup.
+
+        :return: None
+        """
+        self._keys = None
+
+    def get_keys(self):
+        """
+        :return: The cached keys, selecting them from items if necessary.
+        """
+        if self._keys is None:
+            self._keys = _compact_keys([self._selector(item)
+                                        for item in self._items])
+
+        return self._keys
+
+    def index(self, key):
+        """
+        Performs binary search on the cached keys.
+
+        :param key: Key to search for.
+        :return: An index of key, else -1 if not found.
+        """
+        return binary_search(key, self.get_keys())
+
+    def get(self, key, default=None):
+        """
+        :param key: Key to search for.
+        :param default: Value to return if key is not found.
+        :return: An item with key, else default.
+        """
+        i = self.index(key)
+
+        if i == -1:
+            return default
+
+        return self._items[i]
+
+    def __getitem__(self, key):
+        i = self.index(key)
+
+        if i == -1:
+            raise KeyError(key)
+
+        return self._items[i]
+
+    def __contains__(self, key):
+        return self.index(key) != -1
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return "SelectorIndex({!r})".format(self._items)
+
+
+def interpolation_search(key, keys, left=0, right=None):
+    """
+    Performs interpolation search on numeric keys.
+
+    Probes the position at which key would lie if keys were uniformly
+    distributed between keys[left] and keys[right]. On uniform keys this
+    needs O(log log n) probes. The number of interpolation probes is capped,
+    after which the remaining range is binary searched, so skewed keys
+    still cost O(log n).
+
+    :param key: Numeric key to search for.
+    :param keys: Sorted iterable of numeric keys.
+    :param left: Lowest index to consider. Defaults to 0.
+    :param right: Highest index to consider. Defaults to len(keys) - 1.
+    :return: An index of key, else -1 if not found.
+    """
+    if right is None:
+        right = len(keys) - 1
+
+    # Interpolation probes before falling back to binary search
+    probes = 2 * (right - left + 1).bit_length().bit_length() + 2
+
+    while left <= right and probes:
+        low, high = keys[left], keys[right]
+
+        if key < low or key > high:
+            return -1
+
+        if high == low:
+            return left
+
+        mid = left + int((key - low) * (right - left) / (high - low))
+        mid = min(max(mid, left), right)
+
+        if keys[mid] == key:
+            return mid
+        elif keys[mid] > key:
+            right = mid - 1
+        else:
+            left = mid + 1
+
+        probes -= 1
+
+    return binary_search(key, keys, left, right)
+
+
+def exponential_search(key, keys, left=0, right=None):
+    """
+    Performs exponential (galloping) search.
+
+    Doubles a bound from left until it passes key, then binary searches
+    the last gap. Finding a key at distance d from left costs O(log d).
+
+    :param key: Key to search for.
+    :param keys: Sorted iterable of keys.
+    :param left: Lowest index to consider. Defaults to 0.
+    :param right: Highest index to consider. Defaults to len(keys) - 1.
+    :return: An index of key, else -1 if not found.
+    """
+    if right is None:
+        right = len(keys) - 1
+
+    if left > right:
+        return -1
+
+    step = 1
+    bound = left
+
+    while bound < right and keys[bound] < key:
+        left = bound + 1
+        bound = min(bound + step, right)
+        step *= 2
+
+    return binary_search(key, keys, left, bound)
+
+
+# Below this length, binary search is used without inspecting the keys
+SEARCH_AUTO_THRESHOLD = 64
+
+# Number of evenly spaced keys sampled to estimate uniformity
+SEARCH_AUTO_SAMPLES = 8
+
+SEARCH_STRATEGIES = {
+    "binary": binary_search,
+    "interpolation": interpolation_search,
+    "exponential": exponential_search,
+}
+
+
+def choose_strategy(key, keys):
+    """
+    Chooses a search strategy from O(1) probes of keys.
+
+    Exponential search is chosen if key lies within the first sqrt(n) keys.
+    Interpolation search is chosen if keys are numeric and a few evenly
+    spaced samples lie close to the line between the first and last keys.
+    Otherwise, binary search is chosen.
+
+    :param key: Key to search for.
+    :param keys: Sorted iterable of keys.
+    :return: Name of strategy, one of SEARCH_STRATEGIES.
+    """
+    n = len(keys)
+
+    if n < SEARCH_AUTO_THRESHOLD:
+        return "binary"
+
+    if key <= keys[int(n ** 0.5)]:
+        return "exponential"
+
+    low, high = keys[0], keys[-1]
+
+    if not isinstance(low, (int, float)) or not isinstance(high, (int, float)) \
+            or not isinstance(key, (int, float)) or high == low:
+        return "binary"
+
+    # Accept if every sample is within 1/SAMPLES of the span from the line
+    tolerance = (high - low) / SEARCH_AUTO_SAMPLES
+
+    for s in range(1, SEARCH_AUTO_SAMPLES):
+        i = s * (n - 1) // SEARCH_AUTO_SAMPLES
+        expected = low + (high - low) * i / (n - 1)
+
+        if abs(keys[i] - expected) > tolerance:
+            return "binary"
+
+    return "interpolation"
+
+
+def search(key, keys, strategy="auto"):
+    """
+    Performs search with the given strategy.
+
+    :param key: Key to search for.
+    :param keys: Sorted iterable of keys.
+    :param strategy: One of "binary", "interpolation", "exponential" or
+        "auto", which chooses a strategy with choose_strategy.
+    :return: An index of key, else -1 if not found.
+
+    Raises:
+        ValueError: If strategy is unknown.
+    """
+    if strategy == "auto":
+        strategy = choose_strategy(key, keys)
+
+    try:
+        method = SEARCH_STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError("Unknown search strategy {!r}".format(strategy))
+
+    return method(key, keys)
+
+
+class MappedRecordFile:
+    """Sorted sequence of keys backed by a memory-mapped file of fixed-width
+    records.
+
+    Indexing unpacks the key of a record straight from the mapping, so it can
+    be passed to binary_search (or any other search) in place of a list, and
+    a search only reads the O(log n) pages it probes.
+    """
+    __slots__ = ['_file', '_mmap', '_view', '_key', '_key_offset',
+                 '_record_size', '_length']
+
+    def __init__(self, path, key_format, record_size=None, key_offset=0):
+        """
+        Constructs a MappedRecordFile.
+
+        :param path: Path of file, sorted by key.
+        :param key_format: struct format of key within each record, e.g. "<q".
+        :param record_size: Size of each record in bytes. Defaults to size of
+            key_format.
+        :param key_offset: Offset of key within each record in bytes.
+
+        Raises:
+            ValueError: If file size is not a multiple of record_size.
+        """
+        self._key = struct.Struct(key_format)
+        self._key_offset = key_offset
+        self._record_size = record_size or self._key.size
+
+        if self._key_offset + self._key.size > self._record_size:
+            raise ValueError("Key does not fit in {} byte record".format(
+                self._record_size))
+
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+
+        if size % self._record_size:
+            self._file.close()
+            raise ValueError("File size {} is not a multiple of {}".format(
+                size, self._record_size))
+
+        self._length = size // self._record_size
+
+        # Empty files cannot be mapped
+        if size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+        else:
+            self._mmap = None
+            self._view = memoryview(b'')
+
+    def record(self, i):
+        """
+        :param i: Index of record.
+        :return: A memoryview of the ith record, without copying. It must be
+            released (or garbage collected) before this file is closed.
+        """
+        if i < 0:
+            i += self._length
+
+        if not 0 <= i < self._length:
+            raise IndexError(i)
+
+        start = i * self._record_size
+        return self._view[start:start + self._record_size]
+
+    def search(self, key, strategy="binary"):
+        """
+        Performs search for key in this file.
+
+        :param key: Key to search for.
+        :param strategy: Strategy to use, as for search.
+        :return: An index of key, else -1 if not found.
+        """
+        return search(key, self, strategy)
+
+    def close(self):
+        """
+        Releases the mapping and closes the file.
+
+        The file is closed even if the mapping cannot be released, in which
+        case close may be called again once the views are released.
+
+        :return: None
+
+        Raises:
+            BufferError: If a view returned by record is still held.
+        """
+        try:
+            self._view.release()
+
+            if self._mmap is not None:
+                self._mmap.close()
+        finally:
+            self._file.close()
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._length
+
+        if not 0 <= i < self._length:
+            raise IndexError(i)
+
+        key = self._key.unpack_from(self._view,
+                                    i * self._record_size + self._key_offset)
+
+        return key[0] if len(key) == 1 else key
+
+    def __len__(self):
+        return self._length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return "MappedRecordFile({!r})".format(self._file.name)
+
+
+class MappedLineFile:
+    """Memory-mapped text file of lines, sorted by a selected key.
+
+    Searches bisect on byte offsets, skipping forward to the next line
+    boundary after each probe, so neither the file nor an index of line
+    offsets is loaded, and a search only reads the O(log n) pages it probes.
+    """
+    __slots__ = ['_file', '_mmap', '_data', '_key_func', '_encoding']
+
+    def __init__(self, path, key_func=lambda line: line, encoding='utf-8'):
+        """
+        Constructs a MappedLineFile.
+
+        :param path: Path of file, with lines sorted by key.
+        :param key_func: Returns key when applied to line (without newline).
+        :param encoding: Encoding of file.
+        """
+        self._key_func = key_func
+        self._encoding = encoding
+        self._file = open(path, 'rb')
+
+        # Empty files cannot be mapped
+        if os.fstat(self._file.fileno()).st_size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+            self._data = self._mmap
+        else:
+            self._mmap = None
+            self._data = b''
+
+    def _line_start(self, offset, start=0):
+        """
+        :param offset: Byte offset.
+        :param start: Offset of a line start, at or before offset, to search
+            back to.
+        :return: Offset of the start of the line containing offset.
+        """
+        i = self._data.rfind(b'\n', start, offset)
+        return start if i == -1 else i + 1
+
+    def _read_line(self, start):
+        """
+        :param start: Offset of start of line.
+        :return: Tuple of line and offset of next line.
+        """
+        end = self._data.find(b'\n', start)
+        if end == -1:
+            end = len(self._data)
+
+        line = self._data[start:end].decode(self._encoding)
+        if line.endswith('\r'):
+            line = line[:-1]
+
+        return line, end + 1
+
+    def lower_bound(self, key):
+        """
+        Finds the first line with key not less than the given key.
+
+        :param key: Key to search for.
+        :return: Byte offset of line, else size of file if there is none.
+        """
+        # Lines before left have smaller keys, and lines from right onwards
+        # have keys not less than key. Both are line starts.
+        left = 0
+        right = len(self._data)
+
+        while left < right:
+            # Probe the line containing the middle byte, so that either
+            # outcome at least halves the bytes left to search, however long
+            # the line is.
+            mid = self._line_start((left + right) // 2, left)
+
+            line, next_start = self._read_line(mid)
+
+            if self._key_func(line) < key:
+                left = next_start
+            else:
+                right = mid
+
+        return min(left, len(self._data))
+
+    def find(self, key):
+        """
+        Finds a line with the given key.
+
+        :param key: Key to search for.
+        :return: First line with key, else None.
+        """
+        start = self.lower_bound(key)
+
+        if start >= len(self._data):
+            return None
+
+        line, _ = self._read_line(start)
+
+        if self._key_func(line) == key:
+            return line
+
+    def range(self, start_key, stop_key=None):
+        """
+        Yields lines with keys in [start_key, stop_key), in order.
+
+        :param start_key: Smallest key to yield.
+        :param stop_key: Key to stop at. Defaults to end of file.
+        :yield: Lines in range.
+        """
+        start = self.lower_bound(start_key)
+
+        while start < len(self._data):
+            line, start = self._read_line(start)
+
+            if stop_key is not None and not self._key_func(line) < stop_key:
+                return
+
+            yield line
+
+    def close(self):
+        """
+        Releases the mapping and closes the file.
+
+        :return: None
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return "MappedLineFile({!r})".format(self._file.name)
+
+
+def search_lines(path, key, key_func=lambda line: line, encoding='utf-8'):
+    """
+    Performs binary search on the lines of a sorted text file.
+
+    :param path: Path of file, with lines sorted by key.
+    :param key: Key to search for.
+    :param key_func: Returns key when applied to line (without newline).
+    :param encoding: Encoding of file.
+    :return: First line with key, else None if not found.
+    """
+    with MappedLineFile(path, key_func, encoding) as lines:
+        return lines.find(key)
+
+
 from utility import generate_unique_random
 
 if __name__ == "__main__":
@@ -0,0 +1,261 @@
+import os
+import struct
+import tempfile
+import unittest
+from array import array
+
+from binary_search import (MappedLineFile, MappedRecordFile, SelectorIndex,
+                           _compact_keys, binary_search,
+                           binary_search_selector, choose_strategy,
+                           exponential_search, interpolation_search, search)
+
+
+def write_records(keys, path, key_format='<q'):
+    """
+    Writes keys to a file, as fixed-width records.
+    """
+    with open(path, 'wb') as f:
+        for key in keys:
+            f.write(struct.pack(key_format, key))
+
+
+class CountingList(list):
+    """List counting the items read by index."""
+    reads = 0
+
+    def __getitem__(self, i):
+        self.reads += 1
+        return super().__getitem__(i)
+
+
+STRATEGIES = (binary_search, interpolation_search, exponential_search,
+              search)
+
+
+class TestSearch(unittest.TestCase):
+    def check_search(self, keys):
+        """
+        Checks every strategy finds each key, and no keys between or beyond
+        them.
+        """
+        present = set(keys)
+        lookups = sorted(present | {key + 0.5 for key in present} |
+                         {min(keys, default=0) - 1, max(keys, default=0) + 1})
+
+        for method in STRATEGIES:
+            for key in lookups:
+                with self.subTest(method=method.__name__, key=key):
+                    i = method(key, keys)
+
+                    if key in present:
+                        self.assertEqual(keys[i], key)
+                    else:
+                        self.assertEqual(i, -1)
+
+    def test_uniform(self):
+        self.check_search(list(range(0, 3000, 3)))
+
+    def test_skewed(self):
+        self.check_search([2 ** i for i in range(100)])
+        self.check_search(list(range(999)) + [10 ** 9])
+
+    def test_duplicates(self):
+        self.check_search(sorted([5] * 10 + list(range(100)) * 2))
+        self.check_search([7] * 100)
+
+    def test_small(self):
+        for keys in ([], [1], [1, 3], [1, 3, 5]):
+            self.check_search(keys)
+
+    def test_last_candidate(self):
+        # The last remaining candidate used to be skipped
+        self.assertEqual(binary_search(3, [1, 3]), 1)
+        self.assertEqual(binary_search(1, [1]), 0)
+        self.assertEqual(binary_search(2, [1, 3], 1, 1), -1)
+        self.assertEqual(binary_search_selector(3, [(1,), (3,)],
+                                                lambda item: item[0]), 1)
+        self.assertEqual(binary_search_selector(1, [(1,)],
+                                                lambda item: item[0]), 0)
+
+    def test_bounds(self):
+        keys = list(range(10))
+
+        for method in STRATEGIES[:-1]:
+            with self.subTest(method=method.__name__):
+                self.assertEqual(method(5, keys, 2, 7), 5)
+                self.assertEqual(method(1, keys, 2, 7), -1)
+                self.assertEqual(method(8, keys, 2, 7), -1)
+                self.assertEqual(method(5, keys, 6, 5), -1)
+
+    def test_interpolation_probe_cap(self):
+        # Interpolating in keys with one outlier advances one key per probe,
+        # so after a few probes binary search takes over, rather than
+        # reading thousands of keys
+        keys = CountingList(list(range(9999)) + [10 ** 12])
+
+        self.assertEqual(interpolation_search(5000, keys), 5000)
+        self.assertLess(keys.reads, 100)
+
+    def test_choose_strategy(self):
+        uniform = list(range(0, 30000, 3))
+        skewed = [i ** 3 for i in range(10000)]
+
+        self.assertEqual(choose_strategy(5, uniform[:10]), "binary")
+        self.assertEqual(choose_strategy(3, uniform), "exponential")
+        self.assertEqual(choose_strategy(15000, uniform), "interpolation")
+        self.assertEqual(choose_strategy(skewed[5000], skewed), "binary")
+        self.assertEqual(choose_strategy('m', [chr(i) for i in range(200)]),
+                         "binary")
+        self.assertEqual(choose_strategy(7, [7] * 100), "exponential")
+
+    def test_search_strategy(self):
+        keys = list(range(100))
+
+        for strategy in ("auto", "binary", "interpolation", "exponential"):
+            self.assertEqual(search(42, keys, strategy), 42)
+
+        with self.assertRaises(ValueError):
+            search(42, keys, strategy='bogus')
+
+
+class TestSelectorIndex(unittest.TestCase):
+    def setUp(self):
+        self.items = [(key, str(key)) for key in range(0, 100, 2)]
+        self.index = SelectorIndex(self.items, lambda item: item[0])
+
+    def test_lookups(self):
+        index = self.index
+
+        self.assertEqual(index.index(42), 21)
+        self.assertEqual(index.index(43), -1)
+        self.assertEqual(index.get(42), (42, '42'))
+        self.assertIsNone(index.get(43))
+        self.assertEqual(index.get(43, 'missing'), 'missing')
+        self.assertEqual(index[0], (0, '0'))
+        self.assertIn(98, index)
+        self.assertNotIn(100, index)
+        self.assertEqual(len(index), 50)
+
+        with self.assertRaises(KeyError):
+            index[-2]
+
+    def test_refresh(self):
+        self.assertIn(42, self.index)
+        self.items.insert(0, (-2, '-2'))
+
+        # Keys cached before the change are stale, so index is off by one
+        self.assertEqual(self.index.index(42), 21)
+        self.assertNotIn(-2, self.index)
+
+        self.index.refresh()
+        self.assertEqual(self.index.index(42), 22)
+        self.assertEqual(self.index[-2], (-2, '-2'))
+
+    def test_compact_keys(self):
+        self.assertEqual(_compact_keys([1, 2, 3]), array('q', [1, 2, 3]))
+        self.assertEqual(_compact_keys([1.0, 2.5]), array('d', [1.0, 2.5]))
+
+        for keys in ([], [1, 2.5], [1, 2 ** 63], [False, True], ['a', 'b']):
+            with self.subTest(keys=keys):
+                self.assertIs(_compact_keys(keys), keys)
+
+        self.assertIsInstance(self.index.get_keys(), array)
+        self.assertEqual(self.index.get_keys().typecode, 'q')
+
+    def test_uncompacted_keys(self):
+        index = SelectorIndex(['apple', 'banana', 'cherry'], str.upper)
+
+        self.assertEqual(index.get_keys(), ['APPLE', 'BANANA', 'CHERRY'])
+        self.assertEqual(index['CHERRY'], 'cherry')
+        self.assertNotIn('apple', index)
+
+
+class TestMappedRecordFile(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, 'records')
+        write_records(range(0, 200, 2), self._path)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_search(self):
+        with MappedRecordFile(self._path, '<q') as records:
+            self.assertEqual(len(records), 100)
+            self.assertEqual(records.search(84), 42)
+            self.assertEqual(records.search(85), -1)
+
+    def test_close_with_record_held(self):
+        records = MappedRecordFile(self._path, '<q')
+        record = records.record(3)
+
+        with self.assertRaises(BufferError):
+            records.close()
+
+        # The file is closed regardless, and the mapping once released
+        self.assertTrue(records._file.closed)
+        self.assertEqual(struct.unpack('<q', record)[0], 6)
+
+        record.release()
+        records.close()
+        self.assertTrue(records._mmap.closed)
+
+
+class CountingLineFile(MappedLineFile):
+    """MappedLineFile counting the lines it reads."""
+    __slots__ = ['probes']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.probes = 0
+
+    def _read_line(self, start):
+        self.probes += 1
+        return super()._read_line(start)
+
+
+class TestMappedLineFile(unittest.TestCase):
+    def write_lines(self, lines):
+        path = os.path.join(self._directory.name, 'lines')
+
+        with open(path, 'wb') as f:
+            f.write(b'\n'.join(lines) + b'\n')
+
+        return path
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_find(self):
+        keys = ['a{:05}'.format(i) for i in range(1000)]
+        path = self.write_lines([key.encode() for key in keys])
+
+        with MappedLineFile(path) as lines:
+            for i in (0, 1, 499, 998, 999):
+                self.assertEqual(lines.find(keys[i]), keys[i])
+
+            self.assertIsNone(lines.find('a00010x'))
+            self.assertIsNone(lines.find(''))
+            self.assertIsNone(lines.find('b'))
+            self.assertEqual(list(lines.range('a00997')), keys[997:])
+
+    def test_long_line(self):
+        # A line much longer than all the others together must not stop each
+        # probe from halving the bytes left to search
+        keys = ['a{:05}'.format(i) for i in range(2000)]
+        long_line = b'b' + b'x' * (4 * 1024 * 1024)
+        path = self.write_lines([key.encode() for key in keys] + [long_line])
+
+        with CountingLineFile(path) as lines:
+            for key, expected in (('a01999', 'a01999'), ('a00000', 'a00000'),
+                                  ('a02000', None), ('c', None)):
+                lines.probes = 0
+                self.assertEqual(lines.find(key), expected)
+                self.assertLess(lines.probes, 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import math
+
+from avl_tree import AugmentedAVLTree, Monoid
+
+# Latest end of the intervals in a subtree
+MAX_END = Monoid(max, -math.inf, lambda key, value: key[1])
+
+
+class IntervalTree(AugmentedAVLTree):
+    """Represents a set of half-open intervals [start, end), with optional
+    values, supporting queries for the intervals overlapping a point or
+    another interval.
+
+    An AVL tree keyed on (start, end), whose nodes store the latest end of the
+    intervals in their subtree, so that subtrees ending too early to overlap
+    a query are skipped.
+
+    Provides O(log n) insertion/deletion, and overlap queries in
+    O(log n + k log(n / k)) for k results, which is O(log n + k) when the
+    results are consecutive in order of start.
+    """
+    __slots__ = []
+
+    monoid = MAX_END
+
+    def insert(self, e, value=None):
+        """
+        Inserts an interval into this tree, or replaces its value if it is
+        already present.
+
+        :param e: Interval to insert, as a (start, end) tuple.
+        :param value: Optional value to be associated with interval.
+        :return: None
+
+        Raises:
+            ValueError: If end is before start.
+        """
+        start, end = e
+
+        if end < start:
+            raise ValueError("Interval ends before it starts: {!r}".format(e))
+
+        super().insert(e, value)
+
+    def _overlapping_nodes(self, lo, starts_in_time):
+        """
+        Yields the nodes of intervals that end after lo and satisfy
+        starts_in_time, in order.
+
+        :param lo: Intervals must end after this.
+        :param starts_in_time: Function of an interval's start; True if it is
+            early enough to overlap the query.
+        :yield: Nodes.
+        """
+        def visit(node):
+            # Returns False once an interval starts too late, since all after
+            # it in order do too
+            if node is None or not lo < node.aggregate:
+                return True
+
+            if not (yield from visit(node.left_child)):
+                return False
+
+            start, end = node.key
+
+            if not starts_in_time(start):
+                return False
+
+            if lo < end:
+                yield node
+
+            return (yield from visit(node.right_child))
+
+        yield from visit(self._root)
+
+    def overlapping(self, lo, hi):
+        """
+        Yields the intervals overlapping [lo, hi), in order.
+
+        :param lo: Start of query interval.
+        :param hi: End of query interval.
+        :yield: (start, end), value pairs.
+        """
+        for node in self._overlapping_nodes(lo, lambda start: start < hi):
+            yield node.key, node.value
+
+    def containing(self, point):
+        """
+        Yields the intervals containing a point, in order.
+
+        :param point: Point, i.e. a timestamp.
+        :yield: (start, end), value pairs.
+        """
+        for node in self._overlapping_nodes(point,
+                                            lambda start: start <= point):
+            yield node.key, node.value
+
+    def max_end(self):
+        """
+        :return: The latest end of any interval, or -inf if empty.
+        """
+        return self._root.aggregate if self._root else MAX_END.identity
+
+
+def main():
+    import random
+    import time
+
+    rng = random.Random(0)
+    intervals = []
+
+    for _ in range(100000):
+        start = rng.randrange(10 ** 7)
+        intervals.append(((start, start + rng.randrange(1, 1000)), None))
+
+    intervals = sorted(set(intervals))
+
+    start = time.perf_counter()
+    tree = IntervalTree.from_sorted_items(intervals)
+    print("Built from {} sorted intervals in {:.3f}s".format(
+        len(intervals), time.perf_counter() - start))
+
+    points = [rng.randrange(10 ** 7) for _ in range(10000)]
+
+    start = time.perf_counter()
+    found = sum(1 for point in points for _ in tree.containing(point))
+    elapsed = time.perf_counter() - start
+    print("{} stabbing queries found {} intervals in {:.3f}s".format(
+        len(points), found, elapsed))
+
+    start = time.perf_counter()
+    scanned = sum(1 for point in points[:10] for (lo, hi), _ in intervals
+                  if lo <= point < hi)
+    print("Linear scan of {} queries found {} intervals in {:.3f}s".format(
+        10, scanned, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
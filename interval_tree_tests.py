@@ -0,0 +1,38 @@
+import unittest
+
+from interval_tree import IntervalTree
+
+
+class TestIntervalTree(unittest.TestCase):
+    def setUp(self):
+        self.intervals = [((start, start + length), start)
+                          for start in range(0, 100, 5)
+                          for length in (1, 7, 20)]
+
+    def check_queries(self, tree):
+        self.assertEqual(tree.max_end(), 115)
+
+        for point in range(-1, 120):
+            self.assertEqual(list(tree.containing(point)),
+                             [((lo, hi), value)
+                              for (lo, hi), value in self.intervals
+                              if lo <= point < hi])
+
+        self.assertEqual(list(tree.overlapping(10, 12)),
+                         [((lo, hi), value)
+                          for (lo, hi), value in self.intervals
+                          if lo < 12 and 10 < hi])
+
+    def test_insert(self):
+        self.check_queries(IntervalTree(self.intervals))
+
+    def test_from_sorted_items(self):
+        self.check_queries(IntervalTree.from_sorted_items(self.intervals))
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            IntervalTree([((3, 1), None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
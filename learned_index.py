@@ -0,0 +1,209 @@
+from array import array
+
+
+class LearnedIndex:
+    """Represents a static index over sorted numeric keys, using a learned
+    piecewise-linear model of key to position.
+
+    Each segment of the model predicts the position of any of its keys to
+    within max_error, so a lookup routes to a segment, predicts a position,
+    then binary searches a window of at most 2 * max_error + 1 keys.
+    """
+    __slots__ = ['_keys', '_max_error', '_segment_keys', '_segment_slopes',
+                 '_segment_starts', '_lookups', '_probes']
+
+    def __init__(self, keys, max_error=32):
+        """
+        Constructs a LearnedIndex.
+
+        :param keys: Sorted sequence (i.e. list or array) of numeric keys.
+        :param max_error: Maximum distance between the predicted and actual
+            position of each key.
+
+        Raises:
+            ValueError: If max_error is negative.
+        """
+        if max_error < 0:
+            raise ValueError("Invalid max_error {}".format(max_error))
+
+        self._keys = keys
+        self._max_error = max_error
+        self._segment_keys = []
+        self._segment_slopes = array('d')
+        self._segment_starts = array('q')
+        self._lookups = 0
+        self._probes = 0
+
+        self._fit()
+
+        if isinstance(keys, array):
+            self._segment_keys = array(keys.typecode, self._segment_keys)
+
+    def _fit(self):
+        """
+        Fits segments to keys greedily, extending each segment while some
+        slope keeps every key in it within max_error of its position.
+
+        Runs in O(n), where n = len(keys).
+
+        :return: None
+        """
+        keys = self._keys
+        error = self._max_error
+        start = 0
+
+        while start < len(keys):
+            first_key = keys[start]
+
+            # Range of slopes that fit every key in segment so far
+            low_slope, high_slope = 0.0, float('inf')
+            end = start + 1
+
+            while end < len(keys):
+                dx = keys[end] - first_key
+                dy = end - start
+
+                if dx == 0:
+                    if dy > error:
+                        break
+                else:
+                    low = max(low_slope, (dy - error) / dx)
+                    high = min(high_slope, (dy + error) / dx)
+
+                    if low > high:
+                        break
+
+                    low_slope, high_slope = low, high
+
+                end += 1
+
+            if high_slope == float('inf'):
+                slope = low_slope
+            else:
+                slope = (low_slope + high_slope) / 2
+
+            self._segment_keys.append(first_key)
+            self._segment_slopes.append(slope)
+            self._segment_starts.append(start)
+
+            start = end
+
+    def index(self, key):
+        """
+        Finds key using the model, then binary search within the error bound.
+
+        :param key: Key to search for.
+        :return: An index of key, else -1 if not found.
+        """
+        segment_keys = self._segment_keys
+        probes = 0
+
+        # Binary search for the last segment starting at or before key, as
+        # bisect_right, counting probes
+        left, right = 0, len(segment_keys)
+
+        while left < right:
+            mid = (left + right) // 2
+            probes += 1
+
+            if key < segment_keys[mid]:
+                right = mid
+            else:
+                left = mid + 1
+
+        s = left - 1
+        self._lookups += 1
+
+        if s < 0:
+            self._probes += probes
+            return -1
+
+        start = self._segment_starts[s]
+
+        if s + 1 < len(self._segment_starts):
+            end = self._segment_starts[s + 1] - 1
+        else:
+            end = len(self._keys) - 1
+
+        position = start + self._segment_slopes[s] * (key - segment_keys[s])
+
+        # Widen by one to absorb floating point rounding
+        left = max(start, int(position) - self._max_error - 1)
+        right = min(end, int(position) + self._max_error + 1)
+        keys = self._keys
+        found = -1
+
+        while left <= right:
+            mid = (left + right) // 2
+            probes += 1
+
+            if keys[mid] == key:
+                found = mid
+                break
+            elif keys[mid] > key:
+                right = mid - 1
+            else:
+                left = mid + 1
+
+        self._probes += probes
+
+        return found
+
+    def segment_count(self):
+        """
+        :return: Number of segments in the model.
+        """
+        return len(self._segment_keys)
+
+    def model_size(self):
+        """
+        :return: Approximate size of the model in bytes, excluding keys.
+        """
+        if isinstance(self._segment_keys, array):
+            key_size = self._segment_keys.itemsize
+        else:
+            key_size = 8
+
+        return len(self._segment_keys) * (key_size +
+                                          self._segment_slopes.itemsize +
+                                          self._segment_starts.itemsize)
+
+    def average_probes(self):
+        """
+        Returns the average number of keys compared per lookup, counting the
+        probes of both the search over segments and the search within the
+        error window.
+
+        :return: Average probes per lookup, or 0 if there have been none.
+        """
+        if not self._lookups:
+            return 0
+
+        return self._probes / self._lookups
+
+    def __contains__(self, key):
+        return self.index(key) != -1
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return "LearnedIndex({} keys, {} segments)".format(
+            len(self._keys), len(self._segment_keys))
+
+
+from utility import generate_unique_random
+
+if __name__ == "__main__":
+    nums = generate_unique_random(20000, 1000000)
+    nums.sort()
+
+    for max_error in (4, 32, 256):
+        index = LearnedIndex(array('q', nums), max_error)
+
+        for key in nums[::10]:
+            assert nums[index.index(key)] == key
+
+        print("max_error={}: {} segments, {} bytes, {:.1f} probes/lookup".format(
+            max_error, index.segment_count(), index.model_size(),
+            index.average_probes()))
@@ -0,0 +1,36 @@
+import unittest
+
+from learned_index import LearnedIndex
+
+
+class TestLearnedIndex(unittest.TestCase):
+    def test_index(self):
+        keys = [i * i for i in range(1000)]
+        index = LearnedIndex(keys, max_error=8)
+
+        for i, key in enumerate(keys):
+            self.assertEqual(index.index(key), i)
+            self.assertEqual(index.index(key + 1) != -1, key + 1 in keys)
+
+        self.assertEqual(index.index(-1), -1)
+
+    def test_average_probes(self):
+        # Linear keys fit one segment exactly, so each lookup compares with
+        # the one segment key, then finds key at the middle of its window of
+        # 3, except the last key, whose window is cut short to 2
+        index = LearnedIndex(list(range(0, 2000, 2)), max_error=0)
+        self.assertEqual(index.segment_count(), 1)
+        self.assertEqual(index.average_probes(), 0)
+
+        for key in range(0, 2000, 2):
+            index.index(key)
+
+        self.assertAlmostEqual(index.average_probes(), 2001 / 1000)
+
+        # A key before the first segment is rejected after one comparison
+        index.index(-1)
+        self.assertAlmostEqual(index.average_probes(), 2002 / 1001)
+
+
+if __name__ == '__main__':
+    unittest.main()
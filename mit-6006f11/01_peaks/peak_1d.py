@@ -15,8 +15,33 @@ A peak must exist, according to the following theorem:
 
     This is a contradiction, so the assumption that a peak does not exist is
     false. Therefore, there must exist a peak.
+
+Each finder also accepts a numpy.ndarray.
 """
 
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _peak_mask_1d(nums):
+    """
+    Compares A with copies of itself shifted one term left and right.
+
+    :param nums: numpy.ndarray A, of length at least 1.
+    :return: Boolean numpy.ndarray, True at the index of each peak.
+    """
+    is_peak = numpy.ones(len(nums), dtype=bool)
+
+    is_peak[1:] &= nums[1:] >= nums[:-1]
+    is_peak[:-1] &= nums[:-1] >= nums[1:]
+
+    return is_peak
+
+
 def find_1d_peak_naive(nums):
     """
     Returns the index of a peak using a naive linear search.
@@ -33,6 +58,9 @@ def find_1d_peak_naive(nums):
     if len(nums) == 0:
         raise IndexError("Cannot search empty list.")
 
+    if numpy is not None and isinstance(nums, numpy.ndarray):
+        return int(numpy.argmax(_peak_mask_1d(nums)))
+
     # Singleton
     if len(nums) == 1:
         return 0
@@ -85,3 +113,159 @@ def find_1d_peak_binary(nums):
             left = mid
         else:
             return mid
+
+
+def find_all_peaks_1d(nums):
+    """
+    Finds every peak, by comparing A with copies of itself shifted one term
+    left and right.
+
+    Algorithm runs in O(n), where n = len(nums), but in vectorised numpy
+    operations. Requires numpy.
+
+    :param nums: List or numpy.ndarray of numbers, A, to search.
+    :return: numpy.ndarray of the index of each peak, in order.
+
+    Raises:
+        IndexError: If length is 0.
+        ImportError: If numpy is not installed.
+    """
+    if numpy is None:
+        raise ImportError("find_all_peaks_1d requires numpy")
+
+    nums = numpy.asarray(nums)
+
+    if len(nums) == 0:
+        raise IndexError("Cannot search empty list.")
+
+    return numpy.flatnonzero(_peak_mask_1d(nums))
+
+
+def _stream_candidates(values):
+    """
+    Yields every peak of a stream, as it is confirmed by the next term.
+
+    :param values: Iterable of numbers, A.
+    :yield: For each term, a tuple of the lowest index that could still be a
+        peak, and (index, value) of the peak confirmed by that term, else
+        None.
+    """
+    previous = current = None
+
+    for i, value in enumerate(values):
+        peak = None
+
+        # Is the previous term a peak?
+        if i >= 1 and (i == 1 or previous <= current) and current >= value:
+            peak = i - 1, current
+
+        yield i, peak
+
+        previous, current = current, value
+
+    # Check last
+    if current is not None and (i == 0 or previous <= current):
+        yield float('inf'), (i, current)
+
+
+def _stream_prominent_candidates(values, prominence):
+    """
+    Yields the peaks of a stream that rise at least prominence above the
+    lowest term since the last such peak, and are followed by a fall of at
+    least prominence.
+
+    :param values: Iterable of numbers, A.
+    :param prominence: Minimum rise and fall around each peak.
+    :yield: As for _stream_candidates.
+    """
+    low = high = high_i = None
+    rising = True
+
+    for i, value in enumerate(values):
+        peak = None
+
+        if high is None or value > high:
+            high, high_i = value, i
+        if low is None or value < low:
+            low = value
+
+        if rising:
+            if value <= high - prominence:
+                peak = high_i, high
+                low = value
+                rising = False
+        elif value >= low + prominence:
+            high, high_i = value, i
+            rising = True
+
+        yield (high_i if rising else i + 1), peak
+
+    if rising and high is not None and high - low >= prominence:
+        yield float('inf'), (high_i, high)
+
+
+def stream_1d_peaks(values, chunked=False, prominence=None,
+                    min_distance=None):
+    """
+    Yields the index of each peak of a stream, as soon as it is confirmed.
+
+    Algorithm runs in O(n) time, where n is the length of the stream, and
+    O(1) space.
+
+    A peak is confirmed by the term after it, so peaks spanning the boundary
+    between chunks are found as if the stream were not chunked.
+
+    :param values: Iterable of numbers, A, to search. May be unbounded.
+    :param chunked: If True, values is instead an iterable of chunks, each an
+        iterable of numbers, that together form A.
+    :param prominence: If given, only yield peaks that rise at least
+        prominence above the lowest term since the last yielded peak, and
+        are followed by a fall of at least prominence (or the end of A).
+        Only the first index of a flat peak is yielded.
+    :param min_distance: If given, peaks closer than min_distance to the
+        previous peak form a run with it, and only the highest peak of each
+        run (the first, if several are equally high) is yielded. So a peak is
+        compared only with the others in its run, however far the run
+        extends, and is confirmed min_distance terms after the run's last
+        peak. Every term of a flat stretch is a peak, so a run lasts at least
+        as long as any flat stretch in it.
+    :yield: Index of each peak, in order.
+    """
+    if chunked:
+        values = itertools.chain.from_iterable(values)
+
+    if prominence is None:
+        candidates = _stream_candidates(values)
+    else:
+        candidates = _stream_prominent_candidates(values, prominence)
+
+    if not min_distance:
+        for _, peak in candidates:
+            if peak is not None:
+                yield peak[0]
+        return
+
+    # Highest peak of the current run, waiting to be confirmed, and the
+    # index of the run's last peak
+    pending = None
+    last = None
+
+    for frontier, peak in candidates:
+        if peak is not None:
+            if pending is None:
+                pending = peak
+            elif peak[0] - last >= min_distance:
+                yield pending[0]
+                pending = peak
+            elif peak[1] > pending[1]:
+                pending = peak
+
+            last = peak[0]
+
+        # No peak can join the run
+        if pending is not None and frontier >= last + min_distance:
+            yield pending[0]
+            pending = None
+
+    if pending is not None:
+        yield pending[0]
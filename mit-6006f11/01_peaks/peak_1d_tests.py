@@ -1,6 +1,12 @@
+import itertools
 import unittest
 import peak_1d
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class AbstractClasses:
     class AbstractOneDPeakFinder(unittest.TestCase):
         @classmethod
@@ -38,5 +44,114 @@ class TestNaive(AbstractClasses.AbstractOneDPeakFinder, unittest.TestCase):
         cls._method = staticmethod(peak_1d.find_1d_peak_naive)
 
 
+class TestStream(AbstractClasses.AbstractOneDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(
+            lambda nums: next(peak_1d.stream_1d_peaks(iter(nums))))
+
+
+class TestStreamAllPeaks(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(list(peak_1d.stream_1d_peaks([])), [])
+
+    def test_multi_mixed(self):
+        self.assertEqual(
+            list(peak_1d.stream_1d_peaks([20, 1, 5, 2, 6, 9, 1, 10])),
+            [0, 2, 5, 7])
+
+    def test_plateau(self):
+        self.assertEqual(list(peak_1d.stream_1d_peaks([1, 3, 3, 2, 2])),
+                         [1, 2, 4])
+
+    def test_chunked(self):
+        chunks = [[20, 1], [5], [], [2, 6], [9, 1, 10]]
+        self.assertEqual(list(peak_1d.stream_1d_peaks(chunks, chunked=True)),
+                         [0, 2, 5, 7])
+
+    def test_unbounded(self):
+        # 0, 1, 2, 1, 0, 1, 2, 1, 0, ...
+        nums = (abs((i + 2) % 4 - 2) for i in itertools.count())
+        peaks = peak_1d.stream_1d_peaks(nums)
+        self.assertEqual(list(itertools.islice(peaks, 5)), [2, 6, 10, 14, 18])
+
+    def test_prominence(self):
+        nums = [0, 5, 4, 6, 1, 2, 1, 8, 8, 3]
+        self.assertEqual(
+            list(peak_1d.stream_1d_peaks(nums, prominence=3)), [3, 7])
+        self.assertEqual(
+            list(peak_1d.stream_1d_peaks(nums, prominence=1)), [1, 3, 5, 7])
+
+    def test_prominence_ends(self):
+        self.assertEqual(
+            list(peak_1d.stream_1d_peaks([9, 1, 2, 8], prominence=5)), [0, 3])
+        self.assertEqual(
+            list(peak_1d.stream_1d_peaks([1, 2, 3], prominence=5)), [])
+
+    def test_min_distance(self):
+        nums = [0, 5, 0, 7, 0, 6, -1, -2, -1, 4, 0]
+        self.assertEqual(
+            list(peak_1d.stream_1d_peaks(nums, min_distance=3)), [3, 9])
+        self.assertEqual(
+            list(peak_1d.stream_1d_peaks(nums, min_distance=2)), [1, 3, 5, 9])
+
+    def test_min_distance_runs(self):
+        # Each peak is within 3 of the previous, so all form one run, and
+        # only its highest peak is yielded
+        self.assertEqual(list(peak_1d.stream_1d_peaks(
+            [7, 0, 0, 6, 0, 0, 5, 0], min_distance=4)), [0])
+        self.assertEqual(list(peak_1d.stream_1d_peaks(
+            [4, 0, 5, 0, 6, 0], min_distance=3)), [4])
+
+        # Equal peaks in a run yield the first
+        self.assertEqual(list(peak_1d.stream_1d_peaks(
+            [5, 0, 5, 0, 5], min_distance=3)), [0])
+
+        # A gap of min_distance ends a run
+        self.assertEqual(list(peak_1d.stream_1d_peaks(
+            [7, 0, 0, 6, 0, -1, -2, 5, 0], min_distance=4)), [0, 7])
+
+    def test_min_distance_confirmed_early(self):
+        # Peak at 1 is confirmed before the stream ends. (A flat tail would
+        # not do, since each term of it is a peak, extending the run.)
+        nums = itertools.chain([0, 5, 0, 0, 0], itertools.count(-1, -1))
+        peaks = peak_1d.stream_1d_peaks(nums, min_distance=3)
+        self.assertEqual(next(peaks), 1)
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestBinarySearchNumpy(AbstractClasses.AbstractOneDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(
+            lambda nums: peak_1d.find_1d_peak_binary(numpy.array(nums)))
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestNaiveNumpy(AbstractClasses.AbstractOneDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(
+            lambda nums: peak_1d.find_1d_peak_naive(numpy.array(nums)))
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestAllPeaks(unittest.TestCase):
+    def test_empty(self):
+        self.assertRaises(IndexError, peak_1d.find_all_peaks_1d, [])
+
+    def test_singleton(self):
+        self.assertEqual(list(peak_1d.find_all_peaks_1d([1])), [0])
+
+    def test_multi_mixed(self):
+        self.assertEqual(
+            list(peak_1d.find_all_peaks_1d([20, 1, 5, 2, 6, 9, 1, 10])),
+            [0, 2, 5, 7])
+
+    def test_plateau(self):
+        self.assertEqual(list(peak_1d.find_all_peaks_1d([1, 3, 3, 2, 2])),
+                         [1, 2, 4])
+
+
 if __name__ == "__main__":
     unittest.main()
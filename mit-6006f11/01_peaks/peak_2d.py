@@ -8,12 +8,68 @@ Out of bounds comparisons are ignored, as with peak_1d.py
 
 The proof that a peak exists is similar to that of peak_1d.py, but extended
 to two dimensions.
+
+Each finder also accepts a numpy.ndarray, in which case row and column
+maxima are found with argmax. Matrices too large for memory can be searched
+in place as a numpy.memmap, or as a MappedMatrix, which also counts the
+bytes and pages read.
 """
 
+import mmap
+import os
+import struct
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # E, S, W, N
 DELTAS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
 
 
+def _is_ndarray(nums):
+    """
+    :return: True iff nums is a numpy.ndarray.
+    """
+    return numpy is not None and isinstance(nums, numpy.ndarray)
+
+
+def _row_max(nums, i, left, right):
+    """
+    :return: Column index of the maximum of row i, between columns
+        [left, right).
+    """
+    if _is_ndarray(nums):
+        return left + int(numpy.argmax(nums[i, left:right]))
+
+    row = nums[i]
+    max_j = left
+
+    for j in range(left + 1, right):
+        if row[j] > row[max_j]:
+            max_j = j
+
+    return max_j
+
+
+def _column_max(nums, j, top, bottom):
+    """
+    :return: Row index of the maximum of column j, between rows
+        [top, bottom).
+    """
+    if _is_ndarray(nums):
+        return top + int(numpy.argmax(nums[top:bottom, j]))
+
+    max_i = top
+
+    for i in range(top + 1, bottom):
+        if nums[i][j] > nums[max_i][j]:
+            max_i = i
+
+    return max_i
+
+
 def find_2d_peak_greedy(nums):
     """
     Finds a 2d-peak using a greedy ascent algorithm.
@@ -56,11 +112,77 @@ def find_2d_peak_greedy(nums):
             return i, j
 
 
+def find_2d_peak_basins(nums, seeds=None):
+    """
+    Finds the 2d-peak reached by greedy ascent from each of many seeds.
+
+    Algorithm runs in O(mn), where m, n = len(nums), len(nums[0]), no matter
+    how many seeds there are.
+
+    Ascent moves as in find_2d_peak_greedy. Every cell passed through is
+    labelled with the peak its ascent reaches, so an ascent from a later
+    seed stops as soon as it reaches a labelled cell. Each cell is therefore
+    visited once.
+
+    :param nums: The 2d-matrix A to search.
+    :param seeds: Iterable of indices to ascend from. Defaults to every cell.
+    :return: Basin map, as a list of lists, holding for each cell the index
+        of the 2d-peak that ascent from it reaches, or None if no ascent
+        passed through it.
+
+    Raises:
+        IndexError if either dimension is 0.
+    """
+
+    rows, columns = len(nums), len(nums[0])
+
+    if rows == 0 or columns == 0:
+        raise IndexError("Invalid dimensions {}x{}".format(rows, columns))
+
+    if seeds is None:
+        seeds = ((i, j) for i in range(rows) for j in range(columns))
+
+    basins = [[None] * columns for _ in range(rows)]
+
+    for i, j in seeds:
+        path = []
+
+        while basins[i][j] is None:
+            path.append((i, j))
+
+            for di, dj in DELTAS:
+                adj_i = i + di
+                adj_j = j + dj
+
+                # Ignore out of bounds
+                if not (0 <= adj_i < rows and 0 <= adj_j < columns):
+                    continue
+
+                # Move to adjacent, if not less than
+                if nums[adj_i][adj_j] > nums[i][j]:
+                    i = adj_i
+                    j = adj_j
+                    break
+            else:
+                # Reached a peak
+                basins[i][j] = i, j
+
+        peak = basins[i][j]
+
+        for i, j in path:
+            basins[i][j] = peak
+
+    return basins
+
+
 def find_2d_peak_linear_binary(nums):
     """
     Finds a 2d-peak using a linear binary search.
 
-    Algorithm runs in O(...
+    Algorithm runs in O(mn), where m, n = len(nums), len(nums[0])
+
+    The global maximum of each row is checked in turn until one is a 1d-peak
+    in its column. This must happen by the row containing the global maximum.
 
     :param nums: The 2d-matrix A to search.
     :return: Index of 2d-peak.
@@ -76,19 +198,294 @@ def find_2d_peak_linear_binary(nums):
 
     for i in range(rows):
         # Find global maximum in row
-        row = nums[i]
-        global_max = row[0]
-        global_max_j = 0
-
-        for j in range(1, len(row)):
-            if row[j] > global_max:
-                global_max = row[j]
-                global_max_j = j
+        j = _row_max(nums, i, 0, columns)
 
         # Detect 1d-peak in column
-        j = global_max_j
 
         # (top row or > top adj) and (bottom row or > bottom adj.)
         if (i - 1 < 0 or nums[i - 1][j] <= nums[i][j]) and\
                 (i + 1 >= rows or nums[i][j] >= nums[i + 1][j]):
             return i, j
+
+
+def find_2d_peak_halving(nums):
+    """
+    Finds a 2d-peak by halving the columns to search.
+
+    Algorithm runs in O(m log n), where m, n = len(nums), len(nums[0])
+
+    The global maximum of the middle column is found. If a horizontal
+    neighbour is larger, a peak must exist in the half containing that
+    neighbour, so the search continues in that half. Otherwise, the maximum
+    is a peak.
+
+    :param nums: The 2d-matrix A to search.
+    :return: Index of 2d-peak.
+
+    Raises:
+        IndexError if either dimension is 0.
+    """
+
+    rows, columns = len(nums), len(nums[0])
+
+    if rows == 0 or columns == 0:
+        raise IndexError("Invalid dimensions {}x{}".format(rows, columns))
+
+    left = 0
+    right = columns - 1
+
+    while True:
+        j = (left + right) // 2
+        i = _column_max(nums, j, 0, rows)
+
+        if j > left and nums[i][j - 1] > nums[i][j]:  # go left for a peak
+            right = j - 1
+        elif j < right and nums[i][j + 1] > nums[i][j]:  # go right for a peak
+            left = j + 1
+        else:
+            return i, j
+
+
+def find_2d_peak_window(nums):
+    """
+    Finds a 2d-peak by searching quadrants of shrinking windows.
+
+    Algorithm runs in O(m + n), where m, n = len(nums), len(nums[0])
+
+    The window begins as the whole matrix. The maximum is found on the
+    window's middle row and middle column (the cross), together with the
+    best cell seen so far. If it is not a peak, it has a larger neighbour,
+    which must lie in one of the four quadrants bounded by the cross. That
+    neighbour is larger than everything on the quadrant's boundary, so a
+    peak exists within the quadrant, and the search continues there.
+
+    Each window is a quarter of the last, so the cells scanned total
+    O(m + n).
+
+    :param nums: The 2d-matrix A to search.
+    :return: Index of 2d-peak.
+
+    Raises:
+        IndexError if either dimension is 0.
+    """
+
+    rows, columns = len(nums), len(nums[0])
+
+    if rows == 0 or columns == 0:
+        raise IndexError("Invalid dimensions {}x{}".format(rows, columns))
+
+    # Window is rows [top, bottom) and columns [left, right)
+    top, bottom, left, right = 0, rows, 0, columns
+    best = None
+
+    while True:
+        mid_i = (top + bottom) // 2
+        mid_j = (left + right) // 2
+
+        # Maximum of cross and best cell seen
+        i, j = mid_i, _row_max(nums, mid_i, left, right)
+
+        adj_i = _column_max(nums, mid_j, top, bottom)
+        if nums[adj_i][mid_j] > nums[i][j]:
+            i, j = adj_i, mid_j
+
+        if best is not None and nums[best[0]][best[1]] > nums[i][j]:
+            i, j = best
+
+        # Move to largest adjacent, if larger
+        best = None
+        for di, dj in DELTAS:
+            adj_i = i + di
+            adj_j = j + dj
+
+            # Ignore out of bounds
+            if not (0 <= adj_i < rows and 0 <= adj_j < columns):
+                continue
+
+            if nums[adj_i][adj_j] > nums[i][j] and (
+                    best is None or
+                    nums[adj_i][adj_j] > nums[best[0]][best[1]]):
+                best = adj_i, adj_j
+
+        if best is None:
+            return i, j
+
+        # Continue in quadrant containing best
+        if best[0] < mid_i:
+            bottom = mid_i
+        else:
+            top = mid_i + 1
+
+        if best[1] < mid_j:
+            right = mid_j
+        else:
+            left = mid_j + 1
+
+
+def find_all_peaks_2d(nums):
+    """
+    Finds every 2d-peak, by comparing A with copies of itself shifted one
+    cell in each direction.
+
+    Algorithm runs in O(mn), where m, n = len(nums), len(nums[0]), but in
+    vectorised numpy operations. Requires numpy.
+
+    :param nums: The 2d-matrix A to search, as a numpy.ndarray or nested
+        lists.
+    :return: numpy.ndarray of shape (k, 2), with the index of each of the k
+        2d-peaks, in row-major order.
+
+    Raises:
+        IndexError if either dimension is 0.
+        ImportError if numpy is not installed.
+    """
+    if numpy is None:
+        raise ImportError("find_all_peaks_2d requires numpy")
+
+    nums = numpy.asarray(nums)
+
+    if nums.ndim != 2 or 0 in nums.shape:
+        raise IndexError("Invalid dimensions {}".format(
+            "x".join(map(str, nums.shape))))
+
+    is_peak = numpy.ones(nums.shape, dtype=bool)
+
+    is_peak[1:, :] &= nums[1:, :] >= nums[:-1, :]  # >= N
+    is_peak[:-1, :] &= nums[:-1, :] >= nums[1:, :]  # >= S
+    is_peak[:, 1:] &= nums[:, 1:] >= nums[:, :-1]  # >= W
+    is_peak[:, :-1] &= nums[:, :-1] >= nums[:, 1:]  # >= E
+
+    return numpy.argwhere(is_peak)
+
+
+class _MappedRow:
+    """Represents a row of a MappedMatrix."""
+    __slots__ = ['_matrix', '_i']
+
+    def __init__(self, matrix, i):
+        self._matrix = matrix
+        self._i = i
+
+    def __getitem__(self, j):
+        return self._matrix.get(self._i, j)
+
+    def __len__(self):
+        return self._matrix.columns
+
+
+class MappedMatrix:
+    """Represents a matrix stored in a file as row-major, fixed-width cells,
+    read in place through a memory map.
+
+    Indexing as nums[i][j] reads a single cell, so a finder only reads the
+    cells it probes. Counts of cells, bytes and distinct pages read are
+    kept, to confirm how much of the file a finder touched.
+    """
+    __slots__ = ['rows', 'columns', '_cell', '_offset', '_file', '_mmap',
+                 'cells_read', '_pages']
+
+    def __init__(self, path, rows, columns, cell_format='<d', offset=0):
+        """
+        Constructs a MappedMatrix.
+
+        :param path: Path of file.
+        :param rows: Number of rows, m.
+        :param columns: Number of columns, n.
+        :param cell_format: struct format of each cell. Defaults to a
+            little-endian double.
+        :param offset: Offset of first cell in bytes, i.e. to skip a header.
+
+        Raises:
+            ValueError: If the file is too small for the matrix.
+        """
+        self.rows = rows
+        self.columns = columns
+        self._cell = struct.Struct(cell_format)
+        self._offset = offset
+        self._file = open(path, 'rb')
+
+        size = os.fstat(self._file.fileno()).st_size
+        if size < offset + rows * columns * self._cell.size or size == 0:
+            self._file.close()
+            raise ValueError("File of {} bytes is too small for {}x{} "
+                             "matrix".format(size, rows, columns))
+
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.cells_read = 0
+        self._pages = set()
+
+    def get(self, i, j):
+        """
+        Reads a single cell.
+
+        :return: Value of A[i][j].
+        """
+        if not (0 <= i < self.rows and 0 <= j < self.columns):
+            raise IndexError("Index ({}, {}) out of range".format(i, j))
+
+        position = self._offset + (i * self.columns + j) * self._cell.size
+
+        self.cells_read += 1
+        self._pages.add(position // mmap.PAGESIZE)
+        self._pages.add((position + self._cell.size - 1) // mmap.PAGESIZE)
+
+        return self._cell.unpack_from(self._mmap, position)[0]
+
+    def bytes_read(self):
+        """
+        :return: Number of bytes read from cells since last reset.
+        """
+        return self.cells_read * self._cell.size
+
+    def pages_read(self):
+        """
+        :return: Number of distinct pages read from since last reset.
+        """
+        return len(self._pages)
+
+    def total_pages(self):
+        """
+        :return: Number of pages spanned by the matrix.
+        """
+        end = self._offset + self.rows * self.columns * self._cell.size
+        return (end - 1) // mmap.PAGESIZE - self._offset // mmap.PAGESIZE + 1
+
+    def reset_counters(self):
+        """
+        Resets counts of cells, bytes and pages read.
+
+        :return: None
+        """
+        self.cells_read = 0
+        self._pages = set()
+
+    def close(self):
+        """
+        Releases the mapping and closes the file.
+
+        :return: None
+        """
+        self._mmap.close()
+        self._file.close()
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.rows
+
+        if not 0 <= i < self.rows:
+            raise IndexError("Row {} out of range".format(i))
+
+        return _MappedRow(self, i)
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return "MappedMatrix({!r}, {}, {})".format(self._file.name, self.rows,
+                                                  self.columns)
@@ -1,6 +1,64 @@
+import os
+import struct
+import tempfile
 import unittest
 import peak_2d
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def spiral(rows, columns):
+    """
+    Returns a matrix whose values increase along a clockwise spiral from the
+    top-left corner inwards, so that its only peak is the end of the spiral.
+
+    :return: Tuple of matrix and index of its peak.
+    """
+    A = [[None] * columns for _ in range(rows)]
+    i, j = 0, 0
+    di, dj = peak_2d.DELTAS[0]
+
+    for value in range(rows * columns):
+        A[i][j] = value
+        end = i, j
+
+        if not (0 <= i + di < rows and 0 <= j + dj < columns) or \
+                A[i + di][j + dj] is not None:
+            # Turn clockwise
+            di, dj = dj, -di
+
+        i, j = i + di, j + dj
+
+    return A, end
+
+
+def write_matrix(A, path, cell_format='<d'):
+    """
+    Writes matrix A to a file, as row-major, fixed-width cells.
+    """
+    with open(path, 'wb') as f:
+        for row in A:
+            for value in row:
+                f.write(struct.pack(cell_format, value))
+
+
+def mapped(method):
+    """
+    Returns a finder that runs method on a MappedMatrix of its input.
+    """
+    def find(A):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'matrix')
+            write_matrix(A, path)
+
+            with peak_2d.MappedMatrix(path, len(A), len(A[0])) as nums:
+                return method(nums)
+
+    return find
+
 
 class AbstractClasses:
     class AbstractTwoDPeakFinder(unittest.TestCase):
@@ -71,6 +129,11 @@ class AbstractClasses:
             self.assertIn(self._method(A),
                           {(1, 1), (0, 2), (0, 4), (2, 0), (2, 2)})
 
+        def test_spiral(self):
+            for rows, columns in [(1, 9), (9, 1), (7, 9), (16, 16), (31, 24)]:
+                A, peak = spiral(rows, columns)
+                self.assertEqual(self._method(A), peak)
+
 
 class TestBinarySearch(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
     @classmethod
@@ -84,5 +147,178 @@ class TestGreedy(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
         cls._method = staticmethod(peak_2d.find_2d_peak_greedy)
 
 
+class TestHalving(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(peak_2d.find_2d_peak_halving)
+
+
+class TestWindow(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(peak_2d.find_2d_peak_window)
+
+
+class TestBasins(unittest.TestCase):
+    def test_basic(self):
+        self.assertEqual(peak_2d.find_2d_peak_basins([[1]]), [[(0, 0)]])
+
+    def test_multiple(self):
+        A = [
+            [1, 2, 5, 3, 4],
+            [2, 7, 3, 2, 2],
+            [9, 6, 8, 3, 2]
+        ]
+
+        basins = peak_2d.find_2d_peak_basins(A)
+
+        for row in basins:
+            for peak in row:
+                self.assertIn(peak, {(1, 1), (0, 2), (0, 4), (2, 0), (2, 2)})
+
+        self.assertEqual(basins[0][0], (0, 2))
+        self.assertEqual(basins[2][1], (2, 2))
+
+    def test_spiral(self):
+        A, peak = spiral(7, 9)
+        basins = peak_2d.find_2d_peak_basins(A)
+        self.assertEqual(basins, [[peak] * 9 for _ in range(7)])
+
+    def test_seeds(self):
+        A = [
+            [1, 2, 3],
+            [9, 1, 1],
+            [1, 1, 7]
+        ]
+
+        basins = peak_2d.find_2d_peak_basins(A, [(0, 0), (2, 1)])
+
+        self.assertEqual(basins, [
+            [(0, 2), (0, 2), (0, 2)],
+            [None, None, None],
+            [None, (2, 2), (2, 2)]
+        ])
+
+
+class TestHalvingMapped(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(mapped(peak_2d.find_2d_peak_halving))
+
+
+class TestWindowMapped(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(mapped(peak_2d.find_2d_peak_window))
+
+
+class TestMappedMatrix(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, 'matrix')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_get(self):
+        write_matrix([[1, 2, 3], [4, 5, 6]], self._path, '<i')
+
+        with peak_2d.MappedMatrix(self._path, 2, 3, '<i') as nums:
+            self.assertEqual(nums[1][2], 6)
+            self.assertEqual(len(nums), 2)
+            self.assertEqual(len(nums[0]), 3)
+            self.assertEqual(nums.bytes_read(), 4)
+            self.assertRaises(IndexError, nums.get, 2, 0)
+
+    def test_too_small(self):
+        write_matrix([[1, 2, 3]], self._path)
+        self.assertRaises(ValueError, peak_2d.MappedMatrix, self._path, 2, 3)
+
+    def test_sublinear_reads(self):
+        # Rows span many pages, so probing few columns skips most pages
+        rows, columns = 64, 8192
+        A, peak = spiral(rows, columns)
+        write_matrix(A, self._path)
+
+        with peak_2d.MappedMatrix(self._path, rows, columns) as nums:
+            for method in (peak_2d.find_2d_peak_halving,
+                           peak_2d.find_2d_peak_window):
+                nums.reset_counters()
+                self.assertEqual(method(nums), peak)
+                self.assertLess(nums.bytes_read(), rows * columns * 8 // 16)
+                self.assertLess(nums.pages_read(), nums.total_pages() // 2)
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestHalvingMemmap(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        def find(A):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'matrix')
+                write_matrix(A, path)
+                nums = numpy.memmap(path, dtype='<f8', mode='r',
+                                    shape=(len(A), len(A[0])))
+                return peak_2d.find_2d_peak_halving(nums)
+
+        cls._method = staticmethod(find)
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestBinarySearchNumpy(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(
+            lambda A: peak_2d.find_2d_peak_linear_binary(numpy.array(A)))
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestGreedyNumpy(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(
+            lambda A: peak_2d.find_2d_peak_greedy(numpy.array(A)))
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestHalvingNumpy(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(
+            lambda A: peak_2d.find_2d_peak_halving(numpy.array(A)))
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestWindowNumpy(AbstractClasses.AbstractTwoDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(
+            lambda A: peak_2d.find_2d_peak_window(numpy.array(A)))
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestAllPeaks(unittest.TestCase):
+    def test_empty(self):
+        self.assertRaises(IndexError, peak_2d.find_all_peaks_2d, [[]])
+
+    def test_singleton(self):
+        self.assertEqual(peak_2d.find_all_peaks_2d([[1]]).tolist(), [[0, 0]])
+
+    def test_multiple(self):
+        A = [
+            [1, 2, 5, 3, 4],
+            [2, 7, 3, 2, 2],
+            [9, 6, 8, 3, 2]
+        ]
+
+        self.assertEqual(
+            peak_2d.find_all_peaks_2d(A).tolist(),
+            [[0, 2], [0, 4], [1, 1], [2, 0], [2, 2]])
+
+    def test_spiral(self):
+        A, peak = spiral(7, 9)
+        self.assertEqual(peak_2d.find_all_peaks_2d(A).tolist(), [list(peak)])
+
+
 if __name__ == "__main__":
     unittest.main()
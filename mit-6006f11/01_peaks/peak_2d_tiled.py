@@ -0,0 +1,130 @@
+"""
+Finds every 2d-peak of a large matrix in parallel.
+
+The matrix is copied once into shared memory and split into tiles. Each
+worker process searches one tile, together with a one-cell halo of its
+neighbouring tiles, so that cells on a tile's edge are compared with all of
+their neighbours. A worker only reports peaks in its own tile (not its halo),
+so each cell is reported by exactly one tile, and no peaks are duplicated
+at the seams between tiles.
+
+Requires numpy.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy
+
+import peak_2d
+
+# Shared memory blocks attached by this (worker) process, by name
+_attached = {}
+
+
+def _attach(name, shape, dtype):
+    """
+    Attaches to a matrix in shared memory, reusing earlier attachments.
+
+    :return: numpy.ndarray view of the matrix.
+    """
+    if name not in _attached:
+        block = shared_memory.SharedMemory(name)
+        _attached[name] = block, numpy.ndarray(shape, dtype, block.buf)
+
+    return _attached[name][1]
+
+
+def _find_tile_peaks(name, shape, dtype, top, bottom, left, right):
+    """
+    Finds every 2d-peak in a tile of a matrix in shared memory.
+
+    :param name: Name of shared memory block.
+    :param shape: Shape of matrix.
+    :param dtype: dtype of matrix.
+    :param top, bottom: Rows [top, bottom) of tile.
+    :param left, right: Columns [left, right) of tile.
+    :return: numpy.ndarray of shape (k, 2), with the index of each of the k
+        2d-peaks in the tile, relative to the whole matrix.
+    """
+    nums = _attach(name, shape, dtype)
+    rows, columns = shape
+
+    # Include halo
+    halo_top, halo_left = max(top - 1, 0), max(left - 1, 0)
+    halo = nums[halo_top:min(bottom + 1, rows), halo_left:min(right + 1, columns)]
+
+    peaks = peak_2d.find_all_peaks_2d(halo) + (halo_top, halo_left)
+
+    # Exclude peaks in halo, which are reported by neighbouring tiles
+    in_tile = (top <= peaks[:, 0]) & (peaks[:, 0] < bottom) & \
+              (left <= peaks[:, 1]) & (peaks[:, 1] < right)
+
+    return peaks[in_tile]
+
+
+def find_all_peaks_2d_tiled(nums, tile_shape=(1024, 1024), workers=None):
+    """
+    Finds every 2d-peak, searching tiles in parallel worker processes.
+
+    Algorithm runs in O(mn / p) for p workers, where m, n = len(nums),
+    len(nums[0]), plus O(mn) to copy nums into shared memory.
+
+    :param nums: The 2d-matrix A to search, as a numpy.ndarray or nested
+        lists.
+    :param tile_shape: Tuple of the number of rows and columns in each tile.
+    :param workers: Number of worker processes. Defaults to CPU count.
+    :return: numpy.ndarray of shape (k, 2), with the index of each of the k
+        2d-peaks, in row-major order, as for peak_2d.find_all_peaks_2d.
+
+    Raises:
+        IndexError if either dimension is 0.
+    """
+    nums = numpy.asarray(nums)
+
+    if nums.ndim != 2 or 0 in nums.shape:
+        raise IndexError("Invalid dimensions {}".format(
+            "x".join(map(str, nums.shape))))
+
+    rows, columns = nums.shape
+    tile_rows, tile_columns = tile_shape
+
+    block = shared_memory.SharedMemory(create=True, size=nums.nbytes)
+
+    try:
+        shared = numpy.ndarray(nums.shape, nums.dtype, block.buf)
+        shared[:] = nums
+
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(_find_tile_peaks, block.name, nums.shape,
+                            nums.dtype, top, min(top + tile_rows, rows),
+                            left, min(left + tile_columns, columns))
+                for top in range(0, rows, tile_rows)
+                for left in range(0, columns, tile_columns)
+            ]
+
+            peaks = numpy.concatenate([future.result() for future in futures])
+
+        del shared
+    finally:
+        block.close()
+        block.unlink()
+
+    # Row-major order
+    return peaks[numpy.lexsort((peaks[:, 1], peaks[:, 0]))]
+
+
+if __name__ == "__main__":
+    # Throughput by number of workers
+    nums = numpy.random.default_rng(0).random((4096, 4096))
+
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        start = time.perf_counter()
+        peaks = find_all_peaks_2d_tiled(nums, (512, 512), workers)
+        elapsed = time.perf_counter() - start
+
+        print("{} worker(s): {} peaks in {:.2f}s, {:.1f}M cells/s".format(
+            workers, len(peaks), elapsed, nums.size / elapsed / 1e6))
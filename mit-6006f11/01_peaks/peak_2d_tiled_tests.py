@@ -0,0 +1,46 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    import peak_2d
+    import peak_2d_tiled
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestTiled(unittest.TestCase):
+    def test_singleton(self):
+        self.assertEqual(
+            peak_2d_tiled.find_all_peaks_2d_tiled([[1]]).tolist(), [[0, 0]])
+
+    def test_empty(self):
+        self.assertRaises(IndexError, peak_2d_tiled.find_all_peaks_2d_tiled,
+                          [[]])
+
+    def test_seams(self):
+        # Peaks on, and either side of, seams between 2x2 tiles
+        A = [
+            [1, 2, 5, 3, 4],
+            [2, 7, 3, 2, 2],
+            [9, 6, 8, 3, 2]
+        ]
+
+        self.assertEqual(
+            peak_2d_tiled.find_all_peaks_2d_tiled(A, (2, 2), 2).tolist(),
+            [[0, 2], [0, 4], [1, 1], [2, 0], [2, 2]])
+
+    def test_matches_untiled(self):
+        nums = numpy.random.default_rng(0).integers(0, 4, (12, 15))
+
+        for tile_shape in [(1, 1), (5, 2), (4, 8), (100, 100)]:
+            self.assertEqual(
+                peak_2d_tiled.find_all_peaks_2d_tiled(
+                    nums, tile_shape, 2).tolist(),
+                peak_2d.find_all_peaks_2d(nums).tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
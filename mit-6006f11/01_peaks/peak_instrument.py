@@ -0,0 +1,178 @@
+"""
+Counts the cells each peak finder reads, to compare finders on inputs of a
+given shape.
+
+A finder is instrumented by running it on a wrapper of its input, whose
+cells count each read (probe) and each comparison made with them. The
+finders themselves are unchanged, so there is no overhead when they are
+not instrumented.
+"""
+
+import collections
+import random
+import time
+
+import peak_1d
+import peak_2d
+
+Measurement = collections.namedtuple(
+    'Measurement', ['result', 'probes', 'comparisons', 'seconds'])
+
+
+class _Counter:
+    """Represents counts of probes and comparisons."""
+    __slots__ = ['probes', 'comparisons']
+
+    def __init__(self):
+        self.probes = 0
+        self.comparisons = 0
+
+
+class _CountingValue:
+    """Represents a cell's value, which counts comparisons made with it."""
+    __slots__ = ['_value', '_counter']
+
+    def __init__(self, value, counter):
+        self._value = value
+        self._counter = counter
+
+    def _compare(self, other, operator):
+        self._counter.comparisons += 1
+
+        if isinstance(other, _CountingValue):
+            other = other._value
+
+        return operator(self._value, other)
+
+    def __lt__(self, other):
+        return self._compare(other, lambda a, b: a < b)
+
+    def __le__(self, other):
+        return self._compare(other, lambda a, b: a <= b)
+
+    def __gt__(self, other):
+        return self._compare(other, lambda a, b: a > b)
+
+    def __ge__(self, other):
+        return self._compare(other, lambda a, b: a >= b)
+
+    def __eq__(self, other):
+        return self._compare(other, lambda a, b: a == b)
+
+    def __ne__(self, other):
+        return self._compare(other, lambda a, b: a != b)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._value)
+
+
+class _CountingSequence:
+    """Represents a (possibly nested) sequence, which counts each cell read."""
+    __slots__ = ['_items', '_counter']
+
+    def __init__(self, items, counter):
+        self._items = items
+        self._counter = counter
+
+    def __getitem__(self, i):
+        item = self._items[i]
+
+        if isinstance(item, (list, tuple)):
+            return _CountingSequence(item, self._counter)
+
+        self._counter.probes += 1
+        return _CountingValue(item, self._counter)
+
+    def __len__(self):
+        return len(self._items)
+
+
+def instrument(finder, nums):
+    """
+    Runs a finder, counting the cells it reads and the comparisons it makes.
+
+    The finder is run twice: once on nums, to time it, and once on a
+    counting wrapper of nums.
+
+    :param finder: Peak finder, e.g. peak_2d.find_2d_peak_halving.
+    :param nums: List, or list of lists, of numbers to search.
+    :return: Measurement of the finder's result, probes, comparisons and
+        wall time in seconds.
+    """
+    start = time.perf_counter()
+    result = finder(nums)
+    seconds = time.perf_counter() - start
+
+    counter = _Counter()
+    finder(_CountingSequence(nums, counter))
+
+    return Measurement(result, counter.probes, counter.comparisons, seconds)
+
+
+FINDERS_1D = [
+    peak_1d.find_1d_peak_naive,
+    peak_1d.find_1d_peak_binary,
+]
+
+FINDERS_2D = [
+    peak_2d.find_2d_peak_greedy,
+    peak_2d.find_2d_peak_linear_binary,
+    peak_2d.find_2d_peak_halving,
+    peak_2d.find_2d_peak_window,
+]
+
+
+def print_probes(sizes, increasing=False, seed=0):
+    """
+    Prints the probes made by every finder, against the number of cells n.
+
+    1d-finders search lists of length n, and 2d-finders search
+    sqrt(n)xsqrt(n) matrices.
+
+    :param sizes: Iterable of numbers of cells, n.
+    :param increasing: If True, search inputs that increase towards the
+        last cell (the worst case for the naive 1d-finder), else random
+        inputs.
+    :param seed: Seed for random inputs.
+    :return: None
+    """
+    rng = random.Random(seed)
+    finders = FINDERS_1D + FINDERS_2D
+
+    print("{:>10}".format("n") + "".join(
+        "{:>22}".format(finder.__name__[5:]) for finder in finders))
+
+    for n in sizes:
+        side = int(n ** 0.5)
+
+        if increasing:
+            nums = list(range(n))
+            matrix = [[i * side + j for j in range(side)]
+                      for i in range(side)]
+        else:
+            nums = [rng.random() for _ in range(n)]
+            matrix = [[rng.random() for _ in range(side)]
+                      for _ in range(side)]
+
+        row = "{:>10}".format(n)
+
+        for finder in FINDERS_1D:
+            row += "{:>22}".format(instrument(finder, nums).probes)
+
+        for finder in FINDERS_2D:
+            row += "{:>22}".format(instrument(finder, matrix).probes)
+
+        print(row)
+
+
+if __name__ == "__main__":
+    sizes = [4 ** k for k in range(1, 10)]
+
+    print("Random inputs")
+    print_probes(sizes)
+
+    print()
+    print("Increasing inputs")
+    print_probes(sizes, increasing=True)
@@ -0,0 +1,39 @@
+import unittest
+import peak_1d
+import peak_2d
+import peak_instrument
+
+
+class TestInstrument(unittest.TestCase):
+    def test_result(self):
+        nums = [1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1]
+
+        for finder in peak_instrument.FINDERS_1D:
+            self.assertEqual(peak_instrument.instrument(finder, nums).result,
+                             finder(nums))
+
+    def test_naive_probes(self):
+        # Checks first pair, then each triple until the peak at 2
+        measurement = peak_instrument.instrument(peak_1d.find_1d_peak_naive,
+                                                 [1, 2, 3, 1])
+
+        self.assertEqual(measurement.result, 2)
+        self.assertEqual(measurement.probes, 2 + 3 + 3)
+        self.assertEqual(measurement.comparisons, 1 + 2 + 2)
+        self.assertGreaterEqual(measurement.seconds, 0)
+
+    def test_2d_probes(self):
+        A = [[i * 64 + j for j in range(64)] for i in range(64)]
+
+        greedy = peak_instrument.instrument(peak_2d.find_2d_peak_greedy, A)
+        linear = peak_instrument.instrument(peak_2d.find_2d_peak_linear_binary,
+                                            A)
+        halving = peak_instrument.instrument(peak_2d.find_2d_peak_halving, A)
+
+        self.assertEqual(greedy.result, (63, 63))
+        self.assertLess(halving.probes, linear.probes)
+        self.assertLess(halving.probes, 64 * 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+An nd-peak is defined on an n-dimensional array A, such that a cell is no
+less than each of its 2n neighbours (one step either way along each axis).
+
+Out of bounds comparisons are ignored, as with peak_1d.py and peak_2d.py,
+which are the cases n = 1 and n = 2.
+
+Each finder accepts nested lists, or a numpy.ndarray, of any rank.
+"""
+
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _is_ndarray(nums):
+    """
+    :return: True iff nums is a numpy.ndarray.
+    """
+    return numpy is not None and isinstance(nums, numpy.ndarray)
+
+
+def _shape(nums):
+    """
+    :return: Tuple of the length of each dimension of nums.
+
+    Raises:
+        IndexError if any dimension is 0.
+    """
+    if _is_ndarray(nums):
+        shape = nums.shape
+    else:
+        shape = []
+        item = nums
+
+        while isinstance(item, (list, tuple)):
+            shape.append(len(item))
+
+            if not item:
+                break
+
+            item = item[0]
+
+        shape = tuple(shape)
+
+    if not shape or 0 in shape:
+        raise IndexError("Invalid dimensions {}".format(
+            "x".join(map(str, shape))))
+
+    return shape
+
+
+def _get(nums, index):
+    """
+    :return: Value of A at index, a tuple.
+    """
+    if _is_ndarray(nums):
+        return nums[index]
+
+    for i in index:
+        nums = nums[i]
+
+    return nums
+
+
+def _neighbours(shape, index):
+    """
+    Yields the in bounds neighbours of index.
+    """
+    for axis, length in enumerate(shape):
+        for step in (1, -1):
+            i = index[axis] + step
+
+            if 0 <= i < length:
+                yield index[:axis] + (i,) + index[axis + 1:]
+
+
+def _box_max(nums, box):
+    """
+    :param box: List of (start, stop) ranges, one per axis.
+    :return: Index of the maximum of A within box.
+    """
+    if _is_ndarray(nums):
+        cells = nums[tuple(slice(start, stop) for start, stop in box)]
+        offset = numpy.unravel_index(numpy.argmax(cells), cells.shape)
+
+        return tuple(int(start + i) for (start, _), i in zip(box, offset))
+
+    best = None
+
+    for index in itertools.product(*(range(start, stop)
+                                     for start, stop in box)):
+        if best is None or _get(nums, index) > _get(nums, best):
+            best = index
+
+    return best
+
+
+def find_nd_peak_greedy(nums):
+    """
+    Finds an nd-peak using a greedy ascent algorithm.
+
+    Algorithm runs in O(N), where N is the number of cells.
+
+    From the centre, the algorithm moves to a larger neighbour until it
+    cannot proceed, at which point the current position is a peak.
+
+    :param nums: The n-dimensional array A to search.
+    :return: Index of nd-peak, as a tuple.
+
+    Raises:
+        IndexError if any dimension is 0.
+    """
+
+    shape = _shape(nums)
+    index = tuple(length // 2 for length in shape)
+
+    while True:
+        for adj in _neighbours(shape, index):
+            # Move to adjacent, if not less than
+            if _get(nums, adj) > _get(nums, index):
+                index = adj
+                break
+        else:
+            return index
+
+
+def find_nd_peak_halving(nums):
+    """
+    Finds an nd-peak by halving a box along its largest axis.
+
+    Algorithm runs in O(d N^((d - 1) / d)) for an array of N cells in d
+    dimensions of similar length, i.e. O(m + n) for an mxn matrix, which is
+    sub-linear in N for any d.
+
+    The box begins as the whole array. The maximum is found on the slice
+    through the middle of the box's largest axis, together with the best
+    cell seen so far. If it is not a peak, it has a larger neighbour, which
+    must lie within the box, on one side of the slice. That neighbour is
+    larger than everything on the boundary of that side, so a peak exists
+    within it, and the search continues there.
+
+    :param nums: The n-dimensional array A to search.
+    :return: Index of nd-peak, as a tuple.
+
+    Raises:
+        IndexError if any dimension is 0.
+    """
+
+    shape = _shape(nums)
+    box = [(0, length) for length in shape]
+    best = None
+
+    while True:
+        axis = max(range(len(box)), key=lambda k: box[k][1] - box[k][0])
+        start, stop = box[axis]
+        mid = (start + stop) // 2
+
+        # Maximum of slice and best cell seen
+        index = _box_max(nums, box[:axis] + [(mid, mid + 1)] + box[axis + 1:])
+
+        if best is not None and _get(nums, best) > _get(nums, index):
+            index = best
+
+        # Move to largest adjacent, if larger
+        best = None
+        for adj in _neighbours(shape, index):
+            if _get(nums, adj) > _get(nums, index) and (
+                    best is None or _get(nums, adj) > _get(nums, best)):
+                best = adj
+
+        if best is None:
+            return index
+
+        # Continue on side of slice containing best
+        if best[axis] < mid:
+            box[axis] = start, mid
+        else:
+            box[axis] = mid + 1, stop
@@ -0,0 +1,102 @@
+import itertools
+import unittest
+import peak_nd
+from peak_2d_tests import spiral
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class AbstractClasses:
+    class AbstractNDPeakFinder(unittest.TestCase):
+        @classmethod
+        def setUpClass(cls):
+            raise NotImplementedError()
+
+        def assertPeak(self, nums, index):
+            value = peak_nd._get(nums, index)
+
+            for adj in peak_nd._neighbours(peak_nd._shape(nums), index):
+                self.assertLessEqual(peak_nd._get(nums, adj), value)
+
+        def test_basic(self):
+            # Singletons
+            self.assertEqual(self._method([1]), (0,))
+            self.assertEqual(self._method([[1]]), (0, 0))
+            self.assertEqual(self._method([[[1]]]), (0, 0, 0))
+
+        def test_empty(self):
+            self.assertRaises(IndexError, self._method, [])
+            self.assertRaises(IndexError, self._method, [[], []])
+
+        def test_1d(self):
+            self.assertEqual(self._method([1, 2, 3, 4, 5, 6]), (5,))
+            self.assertEqual(self._method([6, 5, 4, 3, 2, 1]), (0,))
+            self.assertEqual(self._method([1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1]),
+                             (5,))
+            self.assertIn(self._method([20, 1, 5, 2, 6, 9, 1, 10]),
+                          {(0,), (2,), (5,), (7,)})
+
+        def test_2d(self):
+            A = [
+                [1, 2, 5, 3, 4],
+                [2, 7, 3, 2, 2],
+                [9, 6, 8, 3, 2]
+            ]
+
+            self.assertIn(self._method(A),
+                          {(1, 1), (0, 2), (0, 4), (2, 0), (2, 2)})
+
+        def test_spiral(self):
+            for rows, columns in [(1, 9), (9, 1), (7, 9), (16, 16)]:
+                A, peak = spiral(rows, columns)
+                self.assertEqual(self._method(A), peak)
+
+        def test_3d_single_peak(self):
+            # Values decrease with distance from (3, 1, 4)
+            A = [[[-abs(x - 3) - abs(y - 1) - abs(t - 4) for t in range(6)]
+                  for y in range(5)] for x in range(7)]
+
+            self.assertEqual(self._method(A), (3, 1, 4))
+
+        def test_3d_multiple(self):
+            # Deterministic pseudo-random volume
+            values = itertools.count(7)
+            A = [[[next(values) * 7919 % 101 for t in range(6)]
+                  for y in range(5)] for x in range(4)]
+
+            self.assertPeak(A, self._method(A))
+
+
+class TestGreedy(AbstractClasses.AbstractNDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(peak_nd.find_nd_peak_greedy)
+
+
+class TestHalving(AbstractClasses.AbstractNDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(peak_nd.find_nd_peak_halving)
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestGreedyNumpy(AbstractClasses.AbstractNDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(
+            lambda nums: peak_nd.find_nd_peak_greedy(numpy.array(nums)))
+
+
+@unittest.skipIf(numpy is None, "requires numpy")
+class TestHalvingNumpy(AbstractClasses.AbstractNDPeakFinder, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._method = staticmethod(
+            lambda nums: peak_nd.find_nd_peak_halving(numpy.array(nums)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,328 @@
+import collections
+import inspect
+import math
+import pickle
+import struct
+import time
+from array import array
+
+# Operations that may be recorded; each is stored by its index in this tuple
+OPERATIONS = ('insert', 'remove', 'delete_min', 'predecessor', 'successor',
+              '__getitem__', '__setitem__', '__delitem__', '__contains__',
+              '__len__')
+
+# Exceptions that are part of the API, and so are expected during a replay
+EXPECTED_ERRORS = (KeyError, IndexError)
+
+_MAGIC = b'TRC1'
+
+# Argument tags
+_NONE = b'n'
+_INT = b'q'
+_FLOAT = b'd'
+_STR = b's'
+_PICKLE = b'p'
+
+_HEADER = struct.Struct('<BB')  # Operation, number of arguments
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+_LENGTH = struct.Struct('<I')
+
+LatencyStats = collections.namedtuple('LatencyStats',
+                                      ['count', 'p50', 'p99', 'max'])
+
+
+def _encode_arg(arg):
+    """
+    :return: Bytes encoding arg, prefixed with its tag.
+    """
+    if arg is None:
+        return _NONE
+    # bool is an int, but must round trip as bool
+    if type(arg) is int and -2 ** 63 <= arg < 2 ** 63:
+        return _INT + _INT64.pack(arg)
+    if type(arg) is float:
+        return _FLOAT + _FLOAT64.pack(arg)
+    if type(arg) is str:
+        data = arg.encode('utf-8')
+        return _STR + _LENGTH.pack(len(data)) + data
+
+    data = pickle.dumps(arg, pickle.HIGHEST_PROTOCOL)
+    return _PICKLE + _LENGTH.pack(len(data)) + data
+
+
+def _read_exactly(fileobj, size):
+    """
+    :return: The next size bytes of fileobj.
+
+    Raises:
+        ValueError: If the file ends first.
+    """
+    data = fileobj.read(size)
+
+    if len(data) != size:
+        raise ValueError("Truncated trace")
+
+    return data
+
+
+def _decode_arg(fileobj):
+    """
+    :return: The next argument encoded in fileobj.
+    """
+    tag = _read_exactly(fileobj, 1)
+
+    if tag == _NONE:
+        return None
+    if tag == _INT:
+        return _INT64.unpack(_read_exactly(fileobj, _INT64.size))[0]
+    if tag == _FLOAT:
+        return _FLOAT64.unpack(_read_exactly(fileobj, _FLOAT64.size))[0]
+
+    length, = _LENGTH.unpack(_read_exactly(fileobj, _LENGTH.size))
+    data = _read_exactly(fileobj, length)
+
+    if tag == _STR:
+        return data.decode('utf-8')
+    if tag == _PICKLE:
+        return pickle.loads(data)
+
+    raise ValueError("Unknown argument tag {!r}".format(tag))
+
+
+def write_header(fileobj):
+    """
+    Writes the header that begins every trace.
+
+    :return: None
+    """
+    fileobj.write(_MAGIC)
+
+
+def write_operation(fileobj, name, args):
+    """
+    Appends an operation to a trace.
+
+    Integers (64 bit), floats and strings are stored directly; other arguments
+    are pickled.
+
+    :param fileobj: Binary file opened for writing, after write_header.
+    :param name: Name of the operation, in OPERATIONS.
+    :param args: Tuple of positional arguments.
+    :return: None
+
+    Raises:
+        ValueError: If name is not in OPERATIONS.
+    """
+    if name not in OPERATIONS:
+        raise ValueError("Unknown operation {!r}".format(name))
+
+    fileobj.write(_HEADER.pack(OPERATIONS.index(name), len(args)) +
+                  b''.join(_encode_arg(arg) for arg in args))
+
+
+def read_trace(fileobj):
+    """
+    Yields the operations in a trace.
+
+    :param fileobj: Binary file opened for reading.
+    :yield: name, args pairs, in the order they were recorded.
+
+    Raises:
+        ValueError: If fileobj is not a trace, or is truncated.
+    """
+    if fileobj.read(len(_MAGIC)) != _MAGIC:
+        raise ValueError("Not a trace")
+
+    while True:
+        header = fileobj.read(_HEADER.size)
+
+        if not header:
+            return
+        if len(header) != _HEADER.size:
+            raise ValueError("Truncated trace")
+
+        operation, arg_count = _HEADER.unpack(header)
+
+        if operation >= len(OPERATIONS):
+            raise ValueError("Unknown operation {}".format(operation))
+
+        yield OPERATIONS[operation], tuple(_decode_arg(fileobj)
+                                           for _ in range(arg_count))
+
+
+class TraceRecorder:
+    """Wraps an AVLTree, PriorityQueue or any object with the same API, and
+    records each call of its operations (those in OPERATIONS) to a trace
+    before forwarding it.
+
+    Keyword arguments of operations are recorded as positional arguments.
+    All other attributes, iteration, repr and str are forwarded without being
+    recorded.
+    """
+    __slots__ = ['_target', '_fileobj']
+
+    def __init__(self, target, fileobj):
+        """
+        Constructs a TraceRecorder and writes the trace's header.
+
+        :param target: Object whose operations to record.
+        :param fileobj: Binary file opened for writing.
+        """
+        self._target = target
+        self._fileobj = fileobj
+
+        write_header(fileobj)
+
+    def get_target(self):
+        """
+        :return: The wrapped object.
+        """
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    # Special methods are looked up on the class, so aren't forwarded by
+    # __getattr__. Without __iter__, iter() would fall back to calling the
+    # recorded __getitem__ with 0, 1, 2... until it raised.
+    def __iter__(self):
+        return iter(self._target)
+
+    def __repr__(self):
+        return repr(self._target)
+
+    def __str__(self):
+        return str(self._target)
+
+
+def _recorded(name):
+    """
+    :return: Method recording, then forwarding, a call of operation name.
+    """
+    def method(self, *args, **kwargs):
+        function = getattr(self._target, name)
+
+        if kwargs:
+            # Traces store positional arguments only
+            bound = inspect.signature(function).bind(*args, **kwargs)
+
+            if bound.kwargs:
+                raise TypeError("Cannot record keyword-only arguments of "
+                                "{}: {}".format(name, ", ".join(bound.kwargs)))
+
+            args = bound.args
+
+        write_operation(self._fileobj, name, args)
+        return function(*args)
+
+    method.__name__ = name
+    return method
+
+
+for _name in OPERATIONS:
+    setattr(TraceRecorder, _name, _recorded(_name))
+
+
+def percentile(samples, fraction):
+    """
+    :param samples: Sorted, non-empty sequence.
+    :param fraction: Fraction in [0, 1], i.e. 0.99 for the 99th percentile.
+    :return: The sample at the given fraction, by the nearest-rank method.
+    """
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+
+def replay(fileobj, backend):
+    """
+    Runs the operations in a trace against a backend, timing each one.
+
+    Expected errors (KeyError, IndexError) are caught, since the recorded
+    operation raised them too.
+
+    :param fileobj: Binary file of a trace, opened for reading.
+    :param backend: Object to run the operations on, i.e. a new AVLTree.
+    :return: Dictionary of operation name to LatencyStats, in nanoseconds.
+    """
+    latencies = {}
+    clock = time.perf_counter_ns
+
+    for name, args in read_trace(fileobj):
+        method = getattr(backend, name)
+
+        start = clock()
+        try:
+            method(*args)
+        except EXPECTED_ERRORS:
+            pass
+        elapsed = clock() - start
+
+        if name not in latencies:
+            latencies[name] = array('q')
+        latencies[name].append(elapsed)
+
+    stats = {}
+
+    for name, samples in latencies.items():
+        samples = sorted(samples)
+        stats[name] = LatencyStats(len(samples), percentile(samples, 0.5),
+                                   percentile(samples, 0.99), samples[-1])
+
+    return stats
+
+
+def print_stats(stats):
+    """
+    Prints a table of LatencyStats from replay.
+
+    :return: None
+    """
+    print("{:<15} {:>9} {:>10} {:>10} {:>10}".format(
+        "operation", "count", "p50 (ns)", "p99 (ns)", "max (ns)"))
+
+    for name, (count, p50, p99, maximum) in sorted(stats.items()):
+        print("{:<15} {:>9} {:>10} {:>10} {:>10}".format(
+            name, count, p50, p99, maximum))
+
+
+def main():
+    import io
+    import random
+
+    from avl_tree import AVLTree
+    from binary_heap import PriorityQueue
+
+    rng = random.Random(0)
+    trace = io.BytesIO()
+    tree = TraceRecorder(AVLTree(), trace)
+
+    for key in rng.sample(range(80000), 20000):
+        tree.insert(key, str(key))
+    for key in rng.sample(range(80000), 20000):
+        key in tree
+        tree.predecessor(key)
+    for key in rng.sample(range(80000), 2000):
+        try:
+            tree.remove(key)
+        except KeyError:
+            pass
+
+    print("AVLTree trace: {} bytes".format(len(trace.getvalue())))
+    trace.seek(0)
+    print_stats(replay(trace, AVLTree()))
+
+    trace = io.BytesIO()
+    heap = TraceRecorder(PriorityQueue(), trace)
+
+    for key in rng.sample(range(80000), 20000):
+        heap.insert(key)
+    while len(heap):
+        heap.delete_min()
+
+    print("\nPriorityQueue trace: {} bytes".format(len(trace.getvalue())))
+    trace.seek(0)
+    print_stats(replay(trace, PriorityQueue()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import io
+import unittest
+
+from avl_tree import AVLTree
+from binary_heap import PriorityQueue
+import op_trace
+from op_trace import TraceRecorder, percentile, read_trace, replay
+
+
+def make_trace(operations):
+    """
+    :param operations: Iterable of name, args pairs.
+    :return: BytesIO of a trace of operations, positioned at its start.
+    """
+    trace = io.BytesIO()
+    op_trace.write_header(trace)
+
+    for name, args in operations:
+        op_trace.write_operation(trace, name, args)
+
+    trace.seek(0)
+    return trace
+
+
+class TestTraceFormat(unittest.TestCase):
+    def test_arguments(self):
+        args = (0, -2 ** 63, 2 ** 63 - 1, 2 ** 63, -2 ** 63 - 1, 10 ** 30,
+                1.5, float('inf'), '', 'snowman ☃', None, True, False,
+                (1, 'a'), [2.5], frozenset({3}))
+        tags = (op_trace._INT,) * 3 + (op_trace._PICKLE,) * 3 + \
+            (op_trace._FLOAT,) * 2 + (op_trace._STR,) * 2 + \
+            (op_trace._NONE,) + (op_trace._PICKLE,) * 5
+
+        for arg, tag in zip(args, tags):
+            with self.subTest(arg=arg):
+                self.assertEqual(op_trace._encode_arg(arg)[:1], tag)
+
+        (name, decoded), = read_trace(make_trace([('insert', args)]))
+
+        self.assertEqual(name, 'insert')
+        self.assertEqual(decoded, args)
+
+        for arg, found in zip(args, decoded):
+            self.assertIs(type(found), type(arg))
+
+    def test_every_operation(self):
+        operations = [(name, (i,)) for i, name in
+                      enumerate(op_trace.OPERATIONS)]
+        self.assertEqual(list(read_trace(make_trace(operations))),
+                         operations)
+
+    def test_unknown_operation(self):
+        with self.assertRaises(ValueError):
+            op_trace.write_operation(io.BytesIO(), 'clear', ())
+
+        trace = make_trace([('insert', (1,))])
+        data = trace.getvalue() + op_trace._HEADER.pack(
+            len(op_trace.OPERATIONS), 0)
+
+        with self.assertRaises(ValueError):
+            list(read_trace(io.BytesIO(data)))
+
+    def test_unknown_tag(self):
+        data = (op_trace._MAGIC + op_trace._HEADER.pack(0, 1) + b'x' +
+                op_trace._LENGTH.pack(0))
+
+        with self.assertRaises(ValueError):
+            list(read_trace(io.BytesIO(data)))
+
+    def test_wrong_magic(self):
+        for data in (b'', b'TRC', b'TRC2'):
+            with self.assertRaises(ValueError):
+                list(read_trace(io.BytesIO(data)))
+
+    def test_truncated(self):
+        data = make_trace([('insert', (1, 'one')),
+                           ('__contains__', (2 ** 70,))]).getvalue()
+
+        # Every prefix ending within an operation is truncated
+        complete = {len(op_trace._MAGIC), len(make_trace(
+            [('insert', (1, 'one'))]).getvalue()), len(data)}
+
+        for end in range(len(op_trace._MAGIC), len(data)):
+            if end in complete:
+                continue
+
+            with self.subTest(end=end):
+                with self.assertRaises(ValueError):
+                    list(read_trace(io.BytesIO(data[:end])))
+
+
+class TestTraceRecorder(unittest.TestCase):
+    def setUp(self):
+        self.trace = io.BytesIO()
+        self.tree = AVLTree([(0, None), (1, None)])
+        self.recorder = TraceRecorder(self.tree, self.trace)
+
+    def recorded(self):
+        self.trace.seek(0)
+        return list(read_trace(self.trace))
+
+    def test_records_operations(self):
+        self.recorder.insert(2, 'two')
+        self.recorder[3] = 'three'
+        self.assertIn(2, self.recorder)
+        self.assertEqual(self.recorder.remove(0), None)
+
+        with self.assertRaises(KeyError):
+            self.recorder.remove(0)
+
+        self.assertEqual(self.recorded(), [
+            ('insert', (2, 'two')), ('__setitem__', (3, 'three')),
+            ('__contains__', (2,)), ('remove', (0,)), ('remove', (0,))])
+
+    def test_keyword_arguments(self):
+        self.recorder.insert(3, value='x')
+        self.recorder.insert(e=4)
+
+        self.assertEqual(self.tree[3], 'x')
+        self.assertIn(4, self.tree)
+        self.assertEqual(self.recorded(), [('insert', (3, 'x')),
+                                           ('insert', (4,))])
+
+        with self.assertRaises(TypeError):
+            self.recorder.insert(5, colour='red')
+
+    def test_forwarded_unrecorded(self):
+        self.assertEqual(next(iter(self.recorder)), 0)
+        self.assertEqual(sorted(self.recorder.keys()), [0, 1])
+        self.assertEqual(repr(self.recorder), repr(self.tree))
+        self.assertEqual(str(self.recorder), str(self.tree))
+        self.assertIs(self.recorder.get_target(), self.tree)
+        self.assertEqual(self.recorded(), [])
+
+        # list() takes a length hint from the recorded __len__, but does not
+        # fall back to indexing
+        self.assertEqual(list(self.recorder), [0, 1])
+        self.assertEqual(self.recorded(), [('__len__', ())])
+
+
+class TestReplay(unittest.TestCase):
+    def test_counts(self):
+        trace = make_trace([('insert', (3, None)), ('insert', (1, 'one')),
+                            ('__contains__', (1,)), ('__contains__', (2,)),
+                            ('remove', (2,)), ('remove', (3,)),
+                            ('__getitem__', (1,)), ('__len__', ())])
+        stats = replay(trace, AVLTree())
+
+        self.assertEqual({name: latency.count
+                          for name, latency in stats.items()},
+                         {'insert': 2, '__contains__': 2, 'remove': 2,
+                          '__getitem__': 1, '__len__': 1})
+
+        for count, p50, p99, maximum in stats.values():
+            self.assertTrue(0 <= p50 <= p99 <= maximum)
+
+    def test_recorded_round_trip(self):
+        trace = io.BytesIO()
+        heap = TraceRecorder(PriorityQueue(), trace)
+
+        for key in (5, 3, 8, 1):
+            heap.insert(key)
+        while len(heap):
+            heap.delete_min()
+
+        trace.seek(0)
+        stats = replay(trace, PriorityQueue())
+
+        self.assertEqual(stats['insert'].count, 4)
+        self.assertEqual(stats['delete_min'].count, 4)
+        self.assertEqual(stats['__len__'].count, 5)
+
+    def test_expected_errors(self):
+        # Operations that raised when recorded raise again, and are counted
+        stats = replay(make_trace([('delete_min', ())]), PriorityQueue())
+        self.assertEqual(stats['delete_min'].count, 1)
+
+        stats = replay(make_trace([('remove', (1,)), ('__getitem__', (1,))]),
+                       AVLTree())
+        self.assertEqual((stats['remove'].count, stats['__getitem__'].count),
+                         (1, 1))
+
+
+class TestPercentile(unittest.TestCase):
+    def test_edges(self):
+        samples = list(range(1, 101))
+
+        self.assertEqual(percentile(samples, 0), 1)
+        self.assertEqual(percentile(samples, 0.001), 1)
+        self.assertEqual(percentile(samples, 0.5), 50)
+        self.assertEqual(percentile(samples, 0.99), 99)
+        self.assertEqual(percentile(samples, 0.995), 100)
+        self.assertEqual(percentile(samples, 1), 100)
+
+    def test_single_sample(self):
+        for fraction in (0, 0.5, 1):
+            self.assertEqual(percentile([7], fraction), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
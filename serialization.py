@@ -0,0 +1,246 @@
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+
+# Column types
+INT = b'q'  # 64 bit signed integers
+FLOAT = b'd'  # 64 bit floats
+NONE = b'n'  # All None, stored in 0 bytes
+OBJECT = b'p'  # Length-prefixed pickles
+
+# Magic, key type, value type, padding, count, key & value column sizes.
+# 32 bytes, so typed key columns are aligned.
+_HEADER = struct.Struct('<4sccxxQQQ')
+_LENGTH = struct.Struct('<I')
+
+# Typed columns are little-endian
+_SWAP = sys.byteorder != 'little'
+
+
+def _encode_column(column):
+    """
+    Encodes a list of keys or values, packing them as an array if they are
+    all ints (that fit in 64 bits) or all floats.
+
+    :return: Tuple of column type and encoded bytes.
+    """
+    for kind, typecode in ((int, 'q'), (float, 'd')):
+        if all(type(item) is kind for item in column):
+            try:
+                packed = array(typecode, column)
+            except OverflowError:
+                break
+
+            if _SWAP:
+                packed.byteswap()
+
+            return typecode.encode(), packed.tobytes()
+
+    if all(item is None for item in column):
+        return NONE, b''
+
+    chunks = []
+
+    for item in column:
+        data = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        chunks.append(_LENGTH.pack(len(data)))
+        chunks.append(data)
+
+    return OBJECT, b''.join(chunks)
+
+
+def _decode_column(kind, data, count):
+    """
+    Decodes a column encoded by _encode_column.
+
+    :param kind: Column type.
+    :param data: Bytes-like object of encoded column.
+    :param count: Number of items in column.
+    :return: List of items.
+
+    Raises:
+        ValueError: If kind is unknown.
+    """
+    if kind in (INT, FLOAT):
+        column = array(kind.decode())
+        column.frombytes(data)
+
+        if _SWAP:
+            column.byteswap()
+
+        return column.tolist()
+
+    if kind == NONE:
+        return [None] * count
+
+    if kind == OBJECT:
+        column = []
+        offset = 0
+
+        for _ in range(count):
+            length, = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            column.append(pickle.loads(data[offset:offset + length]))
+            offset += length
+
+        return column
+
+    raise ValueError("Unknown column type {!r}".format(kind))
+
+
+def dump_columns(fileobj, magic, keys, values):
+    """
+    Writes keys and values as two columns, after a header.
+
+    :param fileobj: Binary file opened for writing.
+    :param magic: 4 bytes identifying the kind of container.
+    :param keys: List of keys.
+    :param values: List of values, the same length as keys.
+    :return: None
+    """
+    key_type, key_data = _encode_column(keys)
+    value_type, value_data = _encode_column(values)
+
+    fileobj.write(_HEADER.pack(magic, key_type, value_type, len(keys),
+                               len(key_data), len(value_data)))
+    fileobj.write(key_data)
+    fileobj.write(value_data)
+
+
+def _read_header(data, magic):
+    """
+    :return: Tuple of key type, value type, count, key size and value size.
+
+    Raises:
+        ValueError: If data does not begin with a header for magic.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated header")
+
+    found, *header = _HEADER.unpack_from(data)
+
+    if found != magic:
+        raise ValueError("Expected {!r}, found {!r}".format(magic, found))
+
+    return header
+
+
+def load_columns(fileobj, magic, use_mmap=False):
+    """
+    Reads columns written by dump_columns, from the current position of
+    fileobj, leaving it positioned after them.
+
+    :param fileobj: Binary file opened for reading.
+    :param magic: 4 bytes identifying the kind of container.
+    :param use_mmap: If True, decodes columns straight from a memory map of
+        fileobj, rather than reading them into memory first. fileobj must be
+        a real file.
+    :return: Tuple of list of keys, list of values.
+
+    Raises:
+        ValueError: If fileobj is not a dump of magic, or is truncated.
+    """
+    start = fileobj.tell()
+
+    if use_mmap:
+        mapped = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+
+        with mapped, memoryview(mapped) as view, view[start:] as data:
+            keys, values, size = _decode_columns(data, magic)
+    else:
+        header = fileobj.read(_HEADER.size)
+        _, _, _, key_size, value_size = _read_header(header, magic)
+        data = header + fileobj.read(key_size + value_size)
+        keys, values, size = _decode_columns(data, magic)
+
+    fileobj.seek(start + size)
+
+    return keys, values
+
+
+def _decode_columns(data, magic):
+    """
+    :param data: Bytes-like object, beginning with a header.
+    :return: Tuple of keys, values and the number of bytes decoded.
+    """
+    key_type, value_type, count, key_size, value_size = _read_header(data,
+                                                                     magic)
+    size = _HEADER.size + key_size + value_size
+
+    if len(data) < size:
+        raise ValueError("Truncated columns")
+
+    with memoryview(data) as view:
+        keys = _decode_column(key_type, view[_HEADER.size:
+                                             _HEADER.size + key_size], count)
+        values = _decode_column(value_type, view[_HEADER.size + key_size:
+                                                 size], count)
+
+    return keys, values, size
+
+
+class MappedKeys:
+    """Represents the typed key column of a dump, read in place from a
+    memory-mapped file.
+
+    Indexing reads straight from the mapping, so a dump of an AVLTree (whose
+    keys are sorted) can be passed to binary_search without loading it.
+    """
+    __slots__ = ['_mmap', '_view', '_keys']
+
+    def __init__(self, fileobj, magic):
+        """
+        Constructs MappedKeys from the dump at the current position of
+        fileobj.
+
+        :param fileobj: Binary file opened for reading.
+        :param magic: 4 bytes identifying the kind of container.
+
+        Raises:
+            ValueError: If the keys are not a typed (int or float) column, or
+                this machine is not little-endian.
+        """
+        start = fileobj.tell()
+        self._mmap = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        try:
+            key_type, _, count, key_size, _ = _read_header(
+                self._view[start:], magic)
+
+            if key_type not in (INT, FLOAT) or _SWAP:
+                raise ValueError("Keys of type {!r} cannot be mapped".format(
+                    key_type))
+
+            offset = start + _HEADER.size
+            self._keys = self._view[offset:offset + key_size].cast(
+                key_type.decode())
+        except ValueError:
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Unmaps the file.
+
+        :return: None
+        """
+        if getattr(self, '_keys', None) is not None:
+            self._keys.release()
+        self._keys = None
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getitem__(self, i):
+        return self._keys[i]
+
+    def __len__(self):
+        return len(self._keys)
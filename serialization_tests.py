@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+
+from avl_tree import AVLTree
+from binary_heap import PriorityQueue
+from binary_search import binary_search
+import serialization
+
+
+class TestDumpLoad(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, 'dump')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def round_trip(self, container, use_mmap):
+        """
+        Dumps a container to a file, then loads it back.
+
+        :return: Loaded container.
+        """
+        with open(self._path, 'wb') as f:
+            container.dump(f)
+
+        with open(self._path, 'rb') as f:
+            return type(container).load(f, use_mmap=use_mmap)
+
+    def check_round_trips(self, items):
+        for cls in (AVLTree, PriorityQueue):
+            for use_mmap in (False, True):
+                with self.subTest(cls=cls.__name__, use_mmap=use_mmap):
+                    container = cls(items)
+                    loaded = self.round_trip(container, use_mmap)
+
+                    self.assertIs(type(loaded), cls)
+                    self.assertEqual(list(loaded.items()),
+                                     list(container.items()))
+
+    def test_typed_columns(self):
+        self.check_round_trips([(key, key / 2) for key in range(-50, 50)])
+        self.check_round_trips([(key / 4, None) for key in range(100)])
+
+    def test_pickled_columns(self):
+        # Strings, and ints too big for 64 bits, are pickled
+        self.check_round_trips([(str(key), [key]) for key in range(100)])
+        self.check_round_trips([(key * 2 ** 64, key) for key in range(100)])
+
+    def test_mixed_column(self):
+        self.check_round_trips([(1, 1), (2, 2.5), (3, None), (4, 'four')])
+
+    def test_empty(self):
+        self.check_round_trips([])
+
+    def test_consecutive_dumps(self):
+        tree = AVLTree((key, key) for key in range(10))
+        queue = PriorityQueue((str(key), None) for key in range(5))
+
+        for use_mmap in (False, True):
+            with open(self._path, 'wb') as f:
+                tree.dump(f)
+                queue.dump(f)
+
+            with open(self._path, 'rb') as f:
+                loaded_tree = AVLTree.load(f, use_mmap)
+                loaded_queue = PriorityQueue.load(f, use_mmap)
+                self.assertEqual(f.read(), b'')
+
+            self.assertEqual(list(loaded_tree.items()), list(tree.items()))
+            self.assertEqual(list(loaded_queue.items()), list(queue.items()))
+
+    def test_wrong_magic(self):
+        with open(self._path, 'wb') as f:
+            PriorityQueue([(1, None)]).dump(f)
+
+        for use_mmap in (False, True):
+            with open(self._path, 'rb') as f:
+                with self.assertRaises(ValueError):
+                    AVLTree.load(f, use_mmap)
+
+    def test_truncated(self):
+        with open(self._path, 'wb') as f:
+            AVLTree((key, None) for key in range(10)).dump(f)
+
+        size = os.path.getsize(self._path)
+
+        for length in (size - 1, 10):
+            with open(self._path, 'r+b') as f:
+                f.truncate(length)
+
+            for use_mmap in (False, True):
+                with open(self._path, 'rb') as f:
+                    with self.assertRaises(ValueError):
+                        AVLTree.load(f, use_mmap)
+
+    def test_map_keys(self):
+        keys = list(range(0, 200, 2))
+
+        with open(self._path, 'wb') as f:
+            AVLTree((key, None) for key in keys).dump(f)
+
+        with open(self._path, 'rb') as f, AVLTree.map_keys(f) as mapped:
+            self.assertEqual(len(mapped), len(keys))
+            self.assertEqual(mapped[10], 20)
+            self.assertEqual(binary_search(84, mapped), 42)
+            self.assertEqual(binary_search(85, mapped), -1)
+
+    def test_map_pickled_keys(self):
+        with open(self._path, 'wb') as f:
+            AVLTree([('a', None)]).dump(f)
+
+        with open(self._path, 'rb') as f:
+            with self.assertRaises(ValueError):
+                AVLTree.map_keys(f)
+
+
+class TestColumns(unittest.TestCase):
+    def test_column_types(self):
+        for column, kind in (([1, 2], serialization.INT),
+                             ([1.0, 2.0], serialization.FLOAT),
+                             ([None, None], serialization.NONE),
+                             ([1, 2.0], serialization.OBJECT),
+                             ([True, False], serialization.OBJECT),
+                             ([2 ** 63], serialization.OBJECT)):
+            with self.subTest(column=column):
+                found, data = serialization._encode_column(column)
+                self.assertEqual(found, kind)
+                self.assertEqual(serialization._decode_column(
+                    kind, data, len(column)), column)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from binary_search import binary_search
+
+# Shared memory blocks attached by this (worker) process, by name
+_attached = {}
+
+
+def _attach(name, typecode, length):
+    """
+    Attaches to a shard in shared memory, reusing earlier attachments.
+
+    :param name: Name of shared memory block.
+    :param typecode: array typecode of keys.
+    :param length: Number of keys in shard.
+    :return: memoryview of keys.
+    """
+    if name not in _attached:
+        block = shared_memory.SharedMemory(name)
+        _attached[name] = block, block.buf.cast(typecode)
+
+    return _attached[name][1][:length]
+
+
+def _search_shard(name, typecode, length, keys):
+    """
+    Performs binary search for each key in a shard in shared memory.
+
+    :param name: Name of shared memory block.
+    :param typecode: array typecode of keys.
+    :param length: Number of keys in shard.
+    :param keys: Keys to search for.
+    :return: List of indices of keys within shard, with -1 if not found.
+    """
+    shard = _attach(name, typecode, length)
+
+    return [binary_search(key, shard) for key in keys]
+
+
+class ShardedSortedIndex:
+    """Represents a sorted sequence of keys, partitioned into shards held in
+    shared memory.
+
+    A query is routed to its shard by binary search over the first key of
+    each shard (the fence keys). Batches of queries are searched in parallel,
+    with one task per shard in a process pool.
+    """
+    __slots__ = ['_typecode', '_fences', '_offsets', '_lengths', '_blocks',
+                 '_views', '_workers', '_pool', '_closed']
+
+    def __init__(self, shards, typecode='q', workers=None):
+        """
+        Constructs a ShardedSortedIndex.
+
+        :param shards: Iterable of sorted shards, each an iterable of keys.
+            Each shard's keys must not be less than the previous shard's.
+        :param typecode: array typecode of keys. Defaults to signed 64-bit.
+        :param workers: Number of worker processes. Defaults to CPU count.
+
+        Raises:
+            ValueError: If shards are out of order.
+        """
+        self._typecode = typecode
+        self._fences = []
+        self._offsets = []
+        self._lengths = []
+        self._blocks = []
+        self._views = []
+        self._workers = workers
+        self._pool = None
+        self._closed = False
+
+        offset = 0
+
+        for shard in shards:
+            keys = array(typecode, shard)
+
+            # Empty shards are unreachable
+            if not keys:
+                continue
+
+            if self._views and keys[0] < self._views[-1][-1]:
+                self.close()
+                raise ValueError("Shard starting with {!r} is out of order"
+                                 .format(keys[0]))
+
+            block = shared_memory.SharedMemory(create=True,
+                                               size=len(keys) * keys.itemsize)
+            view = block.buf.cast(typecode)[:len(keys)]
+            view[:] = keys
+
+            self._blocks.append(block)
+            self._views.append(view)
+            self._fences.append(keys[0])
+            self._offsets.append(offset)
+            self._lengths.append(len(keys))
+
+            offset += len(keys)
+
+        self._fences = array(typecode, self._fences)
+
+    def _check_open(self):
+        """
+        Raises:
+            ValueError: If this index is closed.
+        """
+        if self._closed:
+            raise ValueError("Search of closed ShardedSortedIndex")
+
+    def _route(self, key):
+        """
+        :param key: Key to route.
+        :return: Index of shard that may contain key, else -1.
+        """
+        return bisect_right(self._fences, key) - 1
+
+    def index(self, key):
+        """
+        Performs binary search for key in this process.
+
+        :param key: Key to search for.
+        :return: An index of key over all shards, else -1 if not found.
+
+        Raises:
+            ValueError: If this index is closed.
+        """
+        self._check_open()
+        s = self._route(key)
+
+        if s < 0:
+            return -1
+
+        i = binary_search(key, self._views[s])
+        return -1 if i == -1 else self._offsets[s] + i
+
+    def index_many(self, keys):
+        """
+        Performs binary search for each key, in parallel by shard.
+
+        :param keys: Iterable of keys to search for.
+        :return: List of indices over all shards, in the order of keys, with
+            -1 for keys not found.
+
+        Raises:
+            ValueError: If this index is closed.
+        """
+        self._check_open()
+        keys = list(keys)
+        results = [-1] * len(keys)
+
+        # Positions of queries for each shard
+        batches = {}
+
+        for i, key in enumerate(keys):
+            s = self._route(key)
+
+            if s >= 0:
+                batches.setdefault(s, []).append(i)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self._workers)
+
+        futures = {
+            s: self._pool.submit(_search_shard, self._blocks[s].name,
+                                 self._typecode, self._lengths[s],
+                                 [keys[i] for i in positions])
+            for s, positions in batches.items()
+        }
+
+        for s, future in futures.items():
+            offset = self._offsets[s]
+
+            for i, j in zip(batches[s], future.result()):
+                if j != -1:
+                    results[i] = offset + j
+
+        return results
+
+    def shard_count(self):
+        """
+        :return: Number of (non-empty) shards.
+        """
+        return len(self._blocks)
+
+    def close(self):
+        """
+        Shuts down worker processes and frees shared memory, leaving this
+        index empty. Later searches raise ValueError.
+
+        :return: None
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+        for view in self._views:
+            view.release()
+
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+        self._views = []
+        self._blocks = []
+        self._fences = array(self._typecode)
+        self._offsets = []
+        self._lengths = []
+        self._closed = True
+
+    def __contains__(self, key):
+        return self.index(key) != -1
+
+    def __len__(self):
+        return sum(self._lengths)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return "ShardedSortedIndex({} keys, {} shards)".format(
+            len(self), len(self._blocks))
+
+
+from utility import generate_unique_random
+import random
+
+if __name__ == "__main__":
+    nums = generate_unique_random(100000, 1000000)
+    nums.sort()
+
+    shards = [nums[i:i + 10000] for i in range(0, len(nums), 10000)]
+
+    with ShardedSortedIndex(shards) as index:
+        queries = random.sample(nums, 1000) + [-1, 1000000]
+        results = index.index_many(queries)
+
+        for key, i in zip(queries, results):
+            assert i == -1 or nums[i] == key
+
+        print("{} found {} of {} queries".format(
+            index, sum(i != -1 for i in results), len(queries)))
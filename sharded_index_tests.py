@@ -0,0 +1,73 @@
+import random
+import unittest
+
+from sharded_index import ShardedSortedIndex
+
+
+class TestShardedSortedIndex(unittest.TestCase):
+    def check_index(self, shards):
+        """
+        Checks index and index_many find the same keys as a linear search of
+        the concatenated shards.
+        """
+        keys = [key for shard in shards for key in shard]
+        queries = sorted(set(keys) | {key + 1 for key in keys} |
+                         {min(keys, default=0) - 1})
+        random.Random(0).shuffle(queries)
+
+        with ShardedSortedIndex(shards, workers=1) as index:
+            self.assertEqual(len(index), len(keys))
+            self.assertEqual(index.shard_count(),
+                             sum(1 for shard in shards if shard))
+
+            found = index.index_many(queries)
+            self.assertEqual(found, [index.index(key) for key in queries])
+
+            for key, i in zip(queries, found):
+                with self.subTest(key=key):
+                    if key in keys:
+                        self.assertEqual(keys[i], key)
+                    else:
+                        self.assertEqual(i, -1)
+
+    def test_shards(self):
+        self.check_index([list(range(start, start + 50, 2))
+                          for start in range(0, 500, 50)])
+
+    def test_empty_shards(self):
+        self.check_index([[], [1, 3, 5], [], [], [7, 9], []])
+        self.check_index([[], []])
+        self.check_index([])
+
+    def test_gaps_between_shards(self):
+        # Keys before the first fence are routed to no shard, and keys past
+        # the end of a shard but before the next fence to the shard before
+        self.check_index([[10, 11, 12], [100, 101], [1000]])
+
+    def test_equal_keys_across_fence(self):
+        self.check_index([[1, 3, 5], [5, 5, 7], [7], [7, 8]])
+
+    def test_out_of_order(self):
+        with self.assertRaises(ValueError):
+            ShardedSortedIndex([[1, 5], [4, 6]], workers=1)
+
+    def test_closed(self):
+        index = ShardedSortedIndex([[1, 2], [3, 4]], workers=1)
+        self.assertEqual(index.index_many([4, 1]), [3, 0])
+        index.close()
+
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.shard_count(), 0)
+
+        for search in (lambda: index.index(1), lambda: 1 in index,
+                       lambda: index.index_many([1]),
+                       lambda: index.index_many([])):
+            with self.assertRaises(ValueError):
+                search()
+
+        # Closing again has no effect
+        index.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
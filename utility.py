@@ -1,14 +1,16 @@
 import random
 
-def generate_unique_random(length, range_stop):
+def generate_unique_random(length, range_stop, rng=random):
     """
     Returns a list of unique random integers.
 
-    :param length: The length of the returned list.
+    Runs in O(length) time and space, regardless of range_stop.
+
+    :param length: The length of the returned list, if at most range_stop.
     :param range_stop: Values are in range [0, range_stop)
+    :param rng: Source of randomness, i.e. a seeded random.Random. Defaults to
+        the random module.
     :return: list(int, ...)
     """
 
-    elements = list(range(range_stop))
-    random.shuffle(elements)
-    return elements[:length]
\ No newline at end of file
+    return rng.sample(range(range_stop), min(length, range_stop))
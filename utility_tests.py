@@ -0,0 +1,33 @@
+import random
+import time
+import unittest
+
+from utility import generate_unique_random
+
+
+class TestGenerateUniqueRandom(unittest.TestCase):
+    def test_unique(self):
+        for length, range_stop in ((0, 10), (1, 1), (5, 10), (10, 10),
+                                   (20, 10), (1000, 10 ** 6)):
+            with self.subTest(length=length, range_stop=range_stop):
+                nums = generate_unique_random(length, range_stop)
+
+                self.assertEqual(len(nums), min(length, range_stop))
+                self.assertEqual(len(set(nums)), len(nums))
+                self.assertTrue(all(0 <= num < range_stop for num in nums))
+
+    def test_reproducible(self):
+        self.assertEqual(generate_unique_random(100, 1000, random.Random(3)),
+                         generate_unique_random(100, 1000, random.Random(3)))
+
+    def test_large_range(self):
+        # Takes time proportional to length, not range_stop
+        start = time.perf_counter()
+        nums = generate_unique_random(5, 10 ** 9)
+
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(len(set(nums)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+import math
+import random
+
+
+class Workload:
+    """Generates reproducible streams of integer keys, for tests and
+    benchmarks.
+
+    Each stream is a lazy generator, producing n keys in O(n) time and, unless
+    noted, O(1) space. Two Workloads with the same seed produce the same
+    streams.
+    """
+    __slots__ = ['_random']
+
+    KINDS = ('unique', 'sorted', 'reverse_sorted', 'nearly_sorted', 'zipf',
+             'adversarial')
+
+    def __init__(self, seed=None):
+        """
+        Constructs a Workload.
+
+        :param seed: Seed for random number generator. Defaults to system
+            randomness.
+        """
+        self._random = random.Random(seed)
+
+    def keys(self, kind, n, range_stop=None):
+        """
+        Returns a stream of keys of the given kind.
+
+        :param kind: One of KINDS.
+        :param n: Number of keys.
+        :param range_stop: Keys are in range [0, range_stop). Defaults to 4n.
+        :return: Generator of keys.
+
+        Raises:
+            ValueError: If kind is unknown.
+        """
+        if kind not in self.KINDS:
+            raise ValueError("Unknown workload {!r}".format(kind))
+
+        if range_stop is None:
+            range_stop = 4 * n
+
+        return getattr(self, kind + '_keys')(n, range_stop)
+
+    def unique_keys(self, n, range_stop):
+        """
+        Yields distinct keys in random order.
+
+        Uses O(n) space to remember keys yielded.
+
+        :param n: Number of keys, at most range_stop.
+        :param range_stop: Keys are in range [0, range_stop).
+        :yield: Keys.
+        """
+        # Rejection is only fast while most candidates are unused
+        if 2 * n > range_stop:
+            yield from self._random.sample(range(range_stop), n)
+            return
+
+        seen = set()
+
+        while len(seen) < n:
+            key = self._random.randrange(range_stop)
+
+            if key not in seen:
+                seen.add(key)
+                yield key
+
+    def sorted_keys(self, n, range_stop):
+        """
+        Yields distinct keys in increasing order, with random gaps.
+
+        :param n: Number of keys, at most range_stop.
+        :param range_stop: Keys are in range [0, range_stop).
+        :yield: Keys.
+        """
+        key = -1
+
+        for i in range(n):
+            # Leave room for remaining keys
+            gap_stop = (range_stop - key - 1) - (n - i - 1)
+            mean_gap = (range_stop - key - 1) / (n - i)
+
+            key += self._random.randint(1, max(1, min(gap_stop,
+                                                      int(2 * mean_gap) - 1)))
+            yield key
+
+    def reverse_sorted_keys(self, n, range_stop):
+        """
+        Yields distinct keys in decreasing order, with random gaps.
+
+        :param n: Number of keys, at most range_stop.
+        :param range_stop: Keys are in range [0, range_stop).
+        :yield: Keys.
+        """
+        for key in self.sorted_keys(n, range_stop):
+            yield range_stop - 1 - key
+
+    def nearly_sorted_keys(self, n, range_stop, disorder=0.05):
+        """
+        Yields distinct keys in increasing order, except that some pairs of
+        consecutive keys are swapped.
+
+        :param n: Number of keys, at most range_stop.
+        :param range_stop: Keys are in range [0, range_stop).
+        :param disorder: Probability that each pair is swapped.
+        :yield: Keys.
+        """
+        held = None
+
+        for key in self.sorted_keys(n, range_stop):
+            if held is not None:
+                yield key
+                yield held
+                held = None
+            elif self._random.random() < disorder:
+                held = key
+            else:
+                yield key
+
+        if held is not None:
+            yield held
+
+    def zipf_keys(self, n, range_stop, s=1.0):
+        """
+        Yields keys with Zipf-distributed frequencies, so that key k is
+        chosen with probability proportional to 1 / (k + 1)^s. Keys repeat.
+
+        Samples in O(1) expected time by rejection-inversion (Hormann &
+        Derflinger, 1996).
+
+        :param n: Number of keys.
+        :param range_stop: Keys are in range [0, range_stop).
+        :param s: Exponent, greater than 0. Larger is more skewed.
+        :yield: Keys.
+        """
+        def h(x):
+            return math.exp(-s * math.log(x))
+
+        def h_integral(x):
+            log_x = math.log(x)
+            t = (1 - s) * log_x
+            return (math.expm1(t) / t if abs(t) > 1e-8 else 1 + t / 2) * log_x
+
+        def h_integral_inverse(x):
+            t = max(x * (1 - s), -1)
+            return math.exp(
+                (math.log1p(t) / t if abs(t) > 1e-8 else 1 - t / 2) * x)
+
+        h_integral_1 = h_integral(1.5) - 1
+        h_integral_n = h_integral(range_stop + 0.5)
+        squeeze = 2 - h_integral_inverse(h_integral(2.5) - h(2))
+
+        for _ in range(n):
+            while True:
+                u = h_integral_n + self._random.random() * (h_integral_1 -
+                                                            h_integral_n)
+                x = h_integral_inverse(u)
+                k = min(max(int(x + 0.5), 1), range_stop)
+
+                if k - x <= squeeze or u >= h_integral(k + 0.5) - h(k):
+                    yield k - 1
+                    break
+
+    def adversarial_keys(self, n, range_stop):
+        """
+        Yields distinct keys alternating between the smallest and largest
+        remaining, converging on the middle (i.e. 0, 9, 1, 8, 2, 7, ...).
+
+        Without balancing, a search tree built from these keys degenerates
+        into a zig-zag path, so they exercise double rotations in an AVL tree.
+
+        :param n: Number of keys, at most range_stop.
+        :param range_stop: Keys are in range [0, range_stop).
+        :yield: Keys.
+        """
+        # Split the range in half, unless the low keys need more room
+        middle = min(max(range_stop // 2, n - n // 2), range_stop - n // 2)
+        low = self.sorted_keys(n - n // 2, middle)
+        high = self.reverse_sorted_keys(n // 2, range_stop - middle)
+
+        for i in range(n):
+            if i % 2 == 0:
+                yield next(low)
+            else:
+                yield middle + next(high)
+
+
+if __name__ == "__main__":
+    workload = Workload(0)
+
+    for kind in Workload.KINDS:
+        print("{:>15}: {}".format(kind, list(workload.keys(kind, 12))))
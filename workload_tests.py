@@ -0,0 +1,82 @@
+import unittest
+
+from workload import Workload
+
+# Kinds whose keys may repeat
+REPEATING = ('zipf',)
+
+
+class TestWorkload(unittest.TestCase):
+    def test_reproducible(self):
+        for kind in Workload.KINDS:
+            with self.subTest(kind=kind):
+                self.assertEqual(list(Workload(1).keys(kind, 100)),
+                                 list(Workload(1).keys(kind, 100)))
+
+        self.assertNotEqual(list(Workload(1).keys('unique', 100)),
+                            list(Workload(2).keys('unique', 100)))
+
+    def test_keys(self):
+        for kind in Workload.KINDS:
+            for n, range_stop in ((0, None), (1, None), (1, 1), (100, None),
+                                  (100, 100), (101, 101), (1000, 10 ** 9)):
+                with self.subTest(kind=kind, n=n, range_stop=range_stop):
+                    keys = list(Workload(0).keys(kind, n, range_stop))
+
+                    if range_stop is None:
+                        range_stop = 4 * n
+
+                    self.assertEqual(len(keys), n)
+                    self.assertTrue(all(0 <= key < range_stop
+                                        for key in keys))
+
+                    if kind not in REPEATING:
+                        self.assertEqual(len(set(keys)), n)
+
+    def test_order(self):
+        workload = Workload(0)
+        keys = list(workload.keys('sorted', 1000))
+
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(list(workload.keys('sorted', 100, 100)),
+                         list(range(100)))
+
+        keys = list(workload.keys('reverse_sorted', 1000))
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+        # A permutation of distinct sorted keys, each moved at most one place
+        keys = list(workload.nearly_sorted_keys(1000, 4000, disorder=0.1))
+        ordered = sorted(keys)
+
+        self.assertEqual(len(set(keys)), 1000)
+        self.assertNotEqual(keys, ordered)
+
+        for i, key in enumerate(keys):
+            self.assertIn(key, ordered[max(0, i - 1):i + 2])
+
+    def test_adversarial(self):
+        self.assertEqual(list(Workload(0).keys('adversarial', 10, 10)),
+                         [0, 9, 1, 8, 2, 7, 3, 6, 4, 5])
+        self.assertEqual(list(Workload(0).keys('adversarial', 5, 5)),
+                         [0, 4, 1, 3, 2])
+
+        # As many keys as the range holds, however it splits
+        for n in range(30):
+            for seed in range(3):
+                keys = list(Workload(seed).keys('adversarial', n, n))
+                self.assertEqual(sorted(keys), list(range(n)))
+
+    def test_zipf(self):
+        keys = list(Workload(0).keys('zipf', 10000, 1000))
+
+        # Key 0 is the most frequent, about twice as frequent as key 1
+        self.assertGreater(keys.count(0), keys.count(1) * 1.5)
+        self.assertGreater(keys.count(1), keys.count(10))
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            Workload(0).keys('bogus', 10)
+
+
+if __name__ == '__main__':
+    unittest.main()